@@ -0,0 +1,63 @@
+'''
+性能对比：t6_word_count.count_words 的几种实现
+- line：原来的逐行 re.sub + dict 计数
+- block：按块 translate + Counter 批量计数（默认路径）
+- mmap：内存映射按字节扫描，只在最后解码不同的键
+
+运行方式（在项目根目录下）：
+python benchmarks/bench_count_words.py              # 默认生成约 50 万行的文本
+python benchmarks/bench_count_words.py 2000000      # 指定行数
+'''
+
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import write_text_file
+from t6_word_count import count_words
+
+
+def legacy_count_words(file_path):
+    """
+    原来的逐行实现：每行 re.sub 去掉非字母，再逐个单词用 dict 计数
+    """
+    word_dict={}
+    with open(file_path,'r',encoding='UTF-8') as file:
+        for line in file:
+            str_line = re.sub(r'[^a-zA-Z\s+]',' ',line)
+            for word in str_line.split():
+                word = word.lower()
+                word_dict[word] = word_dict.get(word,0)+1
+    return sorted(word_dict.items(), key=lambda x: (-x[1], x[0]))
+
+
+METHODS = {
+    "line": legacy_count_words,
+    "block": count_words,
+    "mmap": lambda path: count_words(path, use_mmap=True),
+}
+
+
+if __name__ == "__main__":
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "corpus.txt")
+        write_text_file(path, line_count, random.Random(line_count))
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"语料: {line_count} 行, {size_mb:.1f} MB（第一次运行后文件已在页缓存中）")
+
+        expected = None
+        for name, func in METHODS.items():
+            func(path)  # 预热，让文件进入页缓存
+            start_time = time.perf_counter()
+            result = func(path)
+            elapsed = time.perf_counter() - start_time
+            if expected is None:
+                expected = result
+            assert result == expected
+            print(f"{name:>6}: {elapsed:.3f}s  {size_mb / elapsed:.1f} MB/s")
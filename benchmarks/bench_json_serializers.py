@@ -0,0 +1,65 @@
+'''
+性能对比：t8_json_processor 的序列化后端（json / orjson / msgspec）
+
+分别测试：解码整个学生JSON文件、把完整结果编码成缩进格式、把学生列表逐条编码成NDJSON，
+以及 process_student_data 的端到端耗时；没有安装的后端会跳过
+
+运行方式（在项目根目录下）：
+python benchmarks/bench_json_serializers.py              # 默认测试到 10^6 个学生
+python benchmarks/bench_json_serializers.py 100000       # 只测试指定规模
+'''
+
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import write_students_file
+from t8_json_processor import SERIALIZERS, _write_ndjson, get_serializer, process_student_data, summarize_students
+
+
+def timeit(func, *args):
+    start_time = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start_time, result
+
+
+def available_serializers():
+    serializers = []
+    for name in SERIALIZERS:
+        try:
+            serializers.append(get_serializer(name))
+        except ImportError:
+            print(f"跳过 {name}（未安装）")
+    return serializers
+
+
+if __name__ == "__main__":
+    scales = [int(arg) for arg in sys.argv[1:]] or [10**4, 10**5, 10**6]
+    serializers = available_serializers()
+    print(f"{'students':>10} {'serializer':>10} {'decode(s)':>10} {'encode(s)':>10} {'ndjson(s)':>10} {'total(s)':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in scales:
+            input_path = os.path.join(workdir, f"students_{scale}.json")
+            output_path = os.path.join(workdir, f"statistics_{scale}.json")
+            write_students_file(input_path, scale, random.Random(scale))
+            with open(input_path, 'rb') as file:
+                data = file.read()
+            merged_dict = summarize_students(get_serializer("json").loads(data))
+            expected = None
+            for serializer in serializers:
+                decode_time, _ = timeit(serializer.loads, data)
+                encode_time, encoded = timeit(serializer.dumps, merged_dict, True)
+                ndjson_time, _ = timeit(_write_ndjson, io.BytesIO(), map(serializer.dumps, merged_dict["students"]))
+                total_time, _ = timeit(lambda: process_student_data(input_path, output_path, serializer=serializer.name))
+                # 各后端的缩进输出应当完全相同
+                if expected is None:
+                    expected = encoded
+                assert encoded == expected
+                print(f"{scale:>10} {serializer.name:>10} {decode_time:>10.3f} {encode_time:>10.3f} "
+                      f"{ndjson_time:>10.3f} {total_time:>10.3f}")
+            del merged_dict, expected
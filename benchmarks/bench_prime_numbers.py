@@ -0,0 +1,56 @@
+'''
+性能对比：t2_prime_number.prime_numbers 的分段筛实现 vs 原来的逐个试除实现
+
+运行方式（在项目根目录下）：
+python benchmarks/bench_prime_numbers.py
+
+知识点：
+1. time.perf_counter()：高精度计时器，适合测量短时间间隔，比 time.time() 更准确
+2. 试除法逐个判断是 O(n²) 量级，分段筛是 O(n log log n)，n 越大差距越明显
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from t2_prime_number import prime_numbers
+
+
+def legacy_prime_numbers(n):
+    """
+    原来的实现：对每个数从2试除到n-1
+    """
+    if n < 1:
+        return []
+    prime_list = []
+    for i in range(2, n + 1):
+        is_prime = i > 1
+        for j in range(2, i):
+            if i % j == 0:
+                is_prime = False
+                break
+        if is_prime:
+            prime_list.append(i)
+    return prime_list
+
+
+def timeit(func, n):
+    start_time = time.perf_counter()
+    result = func(n)
+    return time.perf_counter() - start_time, len(result)
+
+
+if __name__ == "__main__":
+    print(f"{'n':>12} {'legacy(s)':>12} {'sieve(s)':>12} {'count':>10}")
+    for n in (10**3, 10**4, 3 * 10**4):
+        legacy_time, legacy_count = timeit(legacy_prime_numbers, n)
+        sieve_time, sieve_count = timeit(prime_numbers, n)
+        assert legacy_count == sieve_count
+        print(f"{n:>12} {legacy_time:>12.4f} {sieve_time:>12.4f} {sieve_count:>10}")
+
+    # 原实现在这些规模下已经跑不完，只测分段筛
+    for n in (10**6, 10**7, 10**8):
+        sieve_time, sieve_count = timeit(prime_numbers, n)
+        print(f"{n:>12} {'-':>12} {sieve_time:>12.4f} {sieve_count:>10}")
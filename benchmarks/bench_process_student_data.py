@@ -0,0 +1,105 @@
+'''
+性能对比：t8_json_processor.summarize_students 单遍聚合 vs 原来的 put_in_dict 两遍统计
+
+只比较内存中的统计部分（不含读写JSON文件），分别记录耗时和统计过程中新分配内存的峰值（tracemalloc）
+
+运行方式（在项目根目录下）：
+python benchmarks/bench_process_student_data.py              # 默认测试到 10^6 个学生
+python benchmarks/bench_process_student_data.py 100000       # 只测试指定规模
+'''
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import HOBBIES, SUBJECTS
+from t8_json_processor import summarize_students
+
+
+def put_in_dict(obj, key, value):
+    if not isinstance(obj, dict):
+        raise TypeError("请传入字典类型数据")
+    if not key:
+        raise KeyError("请传入正确的key")
+    if key not in obj:
+        obj[key] = 0
+    obj[key] += value
+
+
+def legacy_summarize(students):
+    """
+    原来的实现：每次累加都经过 put_in_dict，第二遍再计算平均分，学生按 name 汇总
+    """
+    student_avg = {}
+    subject_avg = {}
+    subject_max_info = {}
+    hobbies_info = {}
+    subject_stedent_count = {}
+    student_subject_count = {}
+    for student in students:
+        name = student['name']
+        for subject, score in student['scores'].items():
+            if score:
+                score = int(score)
+                put_in_dict(student_avg, name, score)
+                put_in_dict(student_subject_count, name, 1)
+                put_in_dict(subject_avg, subject, score)
+                put_in_dict(subject_stedent_count, subject, 1)
+                if subject not in subject_max_info or subject_max_info[subject]['score'] < score:
+                    subject_max_info[subject] = {'score': score, 'student': name}
+        for hobby in student['hobbies']:
+            if hobby:
+                put_in_dict(hobbies_info, hobby, 1)
+    for student in students:
+        name = student['name']
+        if name in student_avg and name in student_subject_count:
+            student['average_score'] = round(student_avg[name] / student_subject_count[name], 2)
+    students = sorted(students, key=lambda x: -(x.get('average_score', 0)))
+    for subject, score in subject_avg.items():
+        subject_avg[subject] = round(score / subject_stedent_count[subject], 2)
+    return {
+        "students": students,
+        "subject_averages": subject_avg,
+        "subject_top_scores": subject_max_info,
+        "hobby_distribution": hobbies_info,
+    }
+
+
+def make_students(count, rng):
+    # 名字唯一，两种实现的结果才完全相同
+    return [{
+        "id": 1000 + i,
+        "name": f"学生{i}",
+        "age": rng.randint(17, 24),
+        "scores": {subject: rng.randint(40, 100) for subject in SUBJECTS},
+        "hobbies": rng.sample(HOBBIES, rng.randint(0, 4)),
+        "is_monitor": i == 0,
+    } for i in range(count)]
+
+
+def run(func, students):
+    start_time = time.perf_counter()
+    result = func(students)
+    elapsed = time.perf_counter() - start_time
+    tracemalloc.start()
+    func(students)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+if __name__ == "__main__":
+    scales = [int(arg) for arg in sys.argv[1:]] or [10**4, 10**5, 10**6]
+    print(f"{'students':>10} {'legacy(s)':>10} {'single(s)':>10} {'speedup':>8} {'legacy MB':>10} {'single MB':>10}")
+    for scale in scales:
+        students = make_students(scale, random.Random(scale))
+        legacy_time, legacy_peak, legacy_result = run(legacy_summarize, students)
+        single_time, single_peak, single_result = run(summarize_students, students)
+        assert legacy_result == single_result
+        del legacy_result, single_result
+        print(f"{scale:>10} {legacy_time:>10.3f} {single_time:>10.3f} {legacy_time / single_time:>7.2f}x "
+              f"{legacy_peak / 2**20:>10.1f} {single_peak / 2**20:>10.1f}")
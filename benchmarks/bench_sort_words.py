@@ -0,0 +1,35 @@
+'''
+性能对比：t5_string_sort.sort_words 按长度分桶排序 vs 原来的 (长度, 单词) 元组排序
+
+运行方式（在项目根目录下）：
+python benchmarks/bench_sort_words.py              # 默认测试到 10^7 个单词
+python benchmarks/bench_sort_words.py 100000       # 只测试指定规模
+'''
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import random_words
+from t5_string_sort import sort_words
+
+
+def timeit(text, method):
+    start_time = time.perf_counter()
+    result = sort_words(text, method)
+    return time.perf_counter() - start_time, result
+
+
+if __name__ == "__main__":
+    scales = [int(arg) for arg in sys.argv[1:]] or [10**5, 10**6, 10**7]
+    print(f"{'words':>12} {'key(s)':>10} {'bucket(s)':>10} {'speedup':>8}")
+    for scale in scales:
+        text = " ".join(random_words(scale, random.Random(scale)))
+        key_time, key_result = timeit(text, "key")
+        bucket_time, bucket_result = timeit(text, "bucket")
+        assert key_result == bucket_result
+        del key_result, bucket_result
+        print(f"{scale:>12} {key_time:>10.3f} {bucket_time:>10.3f} {key_time / bucket_time:>7.2f}x")
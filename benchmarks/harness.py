@@ -0,0 +1,109 @@
+'''
+基准测试的公共工具：计时、保存结果、和基线比较
+
+知识点：
+1. time.perf_counter()：高精度单调计时器，测量耗时比 time.time() 更准确
+2. 预热（warmup）：先跑几次不计时，让缓存、文件页缓存等进入稳定状态
+3. 重复多次取中位数：单次计时容易受系统抖动影响，中位数比平均值更稳定
+4. statistics 模块：median()、mean() 等统计函数
+5. 回归检测：本次中位数超过基线中位数的 (1 + threshold) 倍就认为变慢了
+'''
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+
+def measure(func, args=(), warmup=1, repeat=5):
+    """
+    对 func(*args) 预热后重复计时
+
+    参数：
+    func -- 被测函数
+    args -- 参数元组
+    warmup -- 预热次数（不计时）
+    repeat -- 计时次数
+
+    返回：
+    dict -- 包含每次耗时和 min/median/mean 的字典（单位：秒）
+    """
+    for _ in range(warmup):
+        func(*args)
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start_time)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "repeat": repeat,
+        "times": times,
+    }
+
+
+def environment_info():
+    """
+    记录运行环境，方便判断不同机器上的结果能否直接比较
+    """
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_results(results, output_file):
+    """
+    把结果写入JSON文件
+
+    参数：
+    results -- run_benchmarks 生成的结果字典
+    output_file -- 输出文件路径
+    """
+    output_dir = os.path.dirname(output_file)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(output_file, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2, ensure_ascii=False)
+
+
+def load_results(input_file):
+    """
+    读取之前保存的结果，文件不存在返回None
+    """
+    if not os.path.exists(input_file):
+        return None
+    with open(input_file, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    和基线逐项比较中位数耗时
+
+    参数：
+    results -- 本次结果
+    baseline -- 基线结果
+    threshold -- 允许变慢的比例，0.2 表示比基线慢20%以内不算回归
+
+    返回：
+    list -- 每项为 (用例名, 规模, 基线中位数, 本次中位数, 比值, 是否回归)
+    """
+    rows = []
+    for name, case in results["cases"].items():
+        base_case = baseline.get("cases", {}).get(name)
+        if not base_case:
+            continue
+        for scale, stats in case.get("scales", {}).items():
+            base_stats = base_case.get("scales", {}).get(scale)
+            if not base_stats or "median" not in stats or "median" not in base_stats:
+                continue
+            ratio = stats["median"] / base_stats["median"] if base_stats["median"] else float("inf")
+            rows.append((name, scale, base_stats["median"], stats["median"], ratio, ratio > 1 + threshold))
+    return rows
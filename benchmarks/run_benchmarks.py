@@ -0,0 +1,272 @@
+'''
+统一的基准测试入口：在逐渐增大的合成数据上测试 t1-t10 的主要函数，输出JSON结果并和基线比较
+
+运行方式（在项目根目录下）：
+python benchmarks/run_benchmarks.py                          # 运行全部用例，结果写入 benchmarks/results.json
+python benchmarks/run_benchmarks.py --save-baseline          # 同时把本次结果保存为基线
+python benchmarks/run_benchmarks.py -k prime --quick         # 只跑名字包含prime的用例，且只用最小的规模
+python benchmarks/run_benchmarks.py --threshold 0.3          # 比基线慢30%以上才算回归
+
+有回归时退出码为1，可以直接用在CI里。
+
+知识点：
+1. argparse：解析命令行参数
+2. tempfile.TemporaryDirectory()：创建临时目录，with 结束后自动删除，合成的输入文件都放在这里
+3. random.Random(seed)：固定随机种子，每次生成的合成数据都一样，结果才有可比性
+4. 用例注册表：每个用例由"准备数据的函数"和"被测函数"组成，准备数据不计入耗时
+'''
+
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.harness import compare, environment_info, load_results, measure, save_results
+
+DEFAULT_OUTPUT = os.path.join(ROOT_DIR, "benchmarks", "results.json")
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+
+SEED = 20240601
+SUBJECTS = ["语文", "数学", "英语", "物理", "化学"]
+HOBBIES = ["篮球", "编程", "阅读", "足球", "游泳", "绘画", "音乐", "摄影", "旅游", "电影"]
+
+
+# ====================== 合成数据 ======================
+
+def random_words(count, rng):
+    """
+    生成count个随机小写单词
+    """
+    letters = string.ascii_lowercase
+    return ["".join(rng.choices(letters, k=rng.randint(1, 12))) for _ in range(count)]
+
+
+def random_text_lines(line_count, rng, words_per_line=12):
+    """
+    生成带标点的英文文本行，词表较小，保证有足够多的重复词
+    """
+    vocabulary = random_words(2000, rng) + ["the", "and", "good", "bad", "python", "love", "problem"]
+    lines = []
+    for _ in range(line_count):
+        words = rng.choices(vocabulary, k=words_per_line)
+        words[0] = words[0].capitalize()
+        lines.append(" ".join(words) + rng.choice([".", "!", "?", ", 42."]))
+    return lines
+
+
+def write_text_file(path, line_count, rng):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write("\n".join(random_text_lines(line_count, rng)) + "\n")
+
+
+def write_csv_file(path, row_count, rng, column_count=8):
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        file.write(",".join(f"列{i + 1}" for i in range(column_count)) + "\n")
+        for _ in range(row_count):
+            file.write(",".join(f"{rng.uniform(0, 100):.2f}" for _ in range(column_count)) + "\n")
+
+
+def write_students_file(path, student_count, rng):
+    students = []
+    for i in range(student_count):
+        students.append({
+            "id": 1000 + i,
+            "name": f"学生{i}",
+            "age": rng.randint(17, 24),
+            "scores": {subject: rng.randint(40, 100) for subject in SUBJECTS},
+            "hobbies": rng.sample(HOBBIES, rng.randint(0, 4)),
+            "is_monitor": i == 0,
+        })
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(students, file, ensure_ascii=False)
+
+
+def build_quotes_html(quote_count, rng):
+    quotes = []
+    for i in range(quote_count):
+        text = " ".join(random_words(12, rng))
+        tags = "".join(f'<a class="tag" href="#">{tag}</a>' for tag in rng.sample(HOBBIES, 2))
+        quotes.append(
+            f'<div class="quote"><span class="text">"{text}"</span>'
+            f'<small class="author">作者{i % 50}</small><div class="tags">{tags}</div></div>'
+        )
+    return "<html><body>" + "".join(quotes) + "</body></html>"
+
+
+# ====================== 用例 ======================
+# 每个用例：scales 是从小到大的规模，setup(scale, workdir, rng) 返回 (被测函数, 参数元组)
+
+def setup_counter_even(scale, workdir, rng):
+    from t1_counter_even import counter_even
+    return counter_even, (scale,)
+
+
+def setup_prime_numbers(scale, workdir, rng):
+    from t2_prime_number import prime_numbers
+    return prime_numbers, (scale,)
+
+
+def setup_iterative_fib(scale, workdir, rng):
+    from t3_fbi_list import iterative_fib
+    return iterative_fib, (scale,)
+
+
+def setup_recursive_fib(scale, workdir, rng):
+    from t3_fbi_list import recursive_fib
+
+    def run(num):
+        # 每次都从空缓存开始，否则除第一次外全是缓存命中
+        recursive_fib.cache_clear()
+        return [recursive_fib(i) for i in range(num)]
+    return run, (scale,)
+
+
+def setup_generate_fib_primes(scale, workdir, rng):
+    from t2_prime_number import is_prime
+    from t4_fib_prime import generate_fib_primes
+
+    def run(num):
+        is_prime.cache_clear()
+        return generate_fib_primes(num)
+    return run, (scale,)
+
+
+def setup_sort_words(scale, workdir, rng):
+    from t5_string_sort import sort_words
+    return sort_words, (" ".join(random_words(scale, rng)),)
+
+
+def setup_count_words(scale, workdir, rng):
+    from t6_word_count import count_words
+    path = os.path.join(workdir, f"words_{scale}.txt")
+    write_text_file(path, scale, rng)
+    return count_words, (path,)
+
+
+def setup_calculate_average(scale, workdir, rng):
+    from t7_csv_average import calculate_average
+    input_path = os.path.join(workdir, f"input_{scale}.csv")
+    write_csv_file(input_path, scale, rng)
+    return calculate_average, (input_path, os.path.join(workdir, f"output_{scale}.csv"))
+
+
+def setup_process_student_data(scale, workdir, rng):
+    from t8_json_processor import process_student_data
+    input_path = os.path.join(workdir, f"students_{scale}.json")
+    write_students_file(input_path, scale, rng)
+    return process_student_data, (input_path, os.path.join(workdir, f"statistics_{scale}.json"))
+
+
+def setup_analyze_directory(scale, workdir, rng):
+    from t9_text_analyzer import analyze_directory
+    directory = os.path.join(workdir, f"texts_{scale}")
+    os.makedirs(directory)
+    for i in range(10):
+        write_text_file(os.path.join(directory, f"sample{i}.txt"), scale, rng)
+    return analyze_directory, (directory,)
+
+
+def setup_parse_quotes(scale, workdir, rng):
+    from t10_web_scraper_local import parse_quotes
+    return parse_quotes, (build_quotes_html(scale, rng),)
+
+
+CASES = {
+    "counter_even": (setup_counter_even, [10**4, 10**6, 10**8]),
+    "prime_numbers": (setup_prime_numbers, [10**4, 10**5, 10**6]),
+    "iterative_fib": (setup_iterative_fib, [10**3, 10**4, 3 * 10**4]),
+    "recursive_fib": (setup_recursive_fib, [100, 300, 900]),
+    "generate_fib_primes": (setup_generate_fib_primes, [5, 12, 18]),
+    "sort_words": (setup_sort_words, [10**3, 10**4, 10**5]),
+    "count_words": (setup_count_words, [10**2, 10**3, 10**4]),
+    "calculate_average": (setup_calculate_average, [10**2, 10**3, 10**4]),
+    "process_student_data": (setup_process_student_data, [10**2, 10**3, 10**4]),
+    "analyze_directory": (setup_analyze_directory, [10, 100, 1000]),
+    "parse_quotes": (setup_parse_quotes, [10, 100, 1000]),
+}
+
+
+def run_benchmarks(names, warmup=1, repeat=5, quick=False):
+    """
+    依次运行选中的用例，缺少依赖或运行出错的用例记录错误信息后继续
+
+    参数：
+    names -- 要运行的用例名列表
+    warmup -- 预热次数
+    repeat -- 计时次数
+    quick -- 为True时每个用例只跑最小的规模
+
+    返回：
+    dict -- 结果字典，可直接保存为JSON
+    """
+    results = {"environment": environment_info(), "warmup": warmup, "cases": {}}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            setup, scales = CASES[name]
+            case_result = {"scales": {}}
+            results["cases"][name] = case_result
+            for scale in scales[:1] if quick else scales:
+                rng = random.Random(SEED)
+                try:
+                    func, args = setup(scale, workdir, rng)
+                    stats = measure(func, args, warmup=warmup, repeat=repeat)
+                except ImportError as e:
+                    case_result["skipped"] = f"缺少依赖: {e}"
+                    print(f"{name:<24} 跳过（缺少依赖: {e}）")
+                    break
+                except Exception as e:
+                    case_result["scales"][str(scale)] = {"error": f"{type(e).__name__}: {e}"}
+                    print(f"{name:<24} {scale:>12} 出错: {type(e).__name__}: {e}")
+                    continue
+                case_result["scales"][str(scale)] = stats
+                print(f"{name:<24} {scale:>12} median {stats['median']:.6f}s  min {stats['min']:.6f}s")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="运行 t1-t10 的基准测试")
+    parser.add_argument("-k", "--filter", default="", help="只运行名字包含该字符串的用例")
+    parser.add_argument("--warmup", type=int, default=1, help="预热次数")
+    parser.add_argument("--repeat", type=int, default=5, help="计时次数")
+    parser.add_argument("--quick", action="store_true", help="每个用例只跑最小的规模")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="结果JSON文件路径")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线JSON文件路径")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--threshold", type=float, default=0.2, help="比基线慢多少比例算回归")
+    args = parser.parse_args(argv)
+
+    names = [name for name in CASES if args.filter in name]
+    if not names:
+        parser.error(f"没有匹配的用例: {args.filter}")
+
+    results = run_benchmarks(names, args.warmup, args.repeat, args.quick)
+    save_results(results, args.output)
+    print(f"\n结果已写入 {args.output}")
+
+    regressions = []
+    baseline = load_results(args.baseline)
+    if baseline is not None:
+        print(f"\n与基线 {args.baseline} 比较（阈值 {args.threshold:.0%}）:")
+        for name, scale, base_median, median, ratio, regressed in compare(results, baseline, args.threshold):
+            flag = "回归!" if regressed else ""
+            print(f"{name:<24} {scale:>12} {base_median:.6f}s -> {median:.6f}s  x{ratio:.2f} {flag}")
+            if regressed:
+                regressions.append((name, scale))
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"基线已保存到 {args.baseline}")
+
+    if regressions:
+        print(f"\n发现 {len(regressions)} 项性能回归")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
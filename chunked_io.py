@@ -0,0 +1,176 @@
+'''
+分块处理大文件的通用工具，与具体题目无关的部分放在这里：
+- t6_word_count、t7_csv_average 要把文件按行切成多段交给多个进程处理，再按块读取每一段
+- t5_string_sort、t8_json_processor 的外部排序要把排好序的记录写成临时的有序段文件，再分轮归并
+
+知识点：
+1. 按换行对齐切分：先按字节数平均切开，再用 file.seek(offset) + file.readline() 把每个边界挪到下一行开头，
+   保证一行不会被分到两段里；UTF-8 中换行符 b'\\n' 不会出现在多字节字符内部，所以每段都能单独解码
+2. 按块读取：每次 read() 约 block_size 字节，块尾不完整的行留给下一块，Python 层的循环次数与行数无关
+3. 有序段（run）：每条记录编码成一行，由调用方提供排序键（key）和编解码方式（RunCodec）；
+   heapq.merge() 做k路归并，每个文件同一时刻只需要读一行，并且是稳定的，键相同的记录保持先后顺序
+4. contextlib.contextmanager：用生成器写 with 语句的上下文管理器，yield 之前打开文件，finally 中关闭
+'''
+
+import heapq
+import os
+from contextlib import contextmanager
+
+# 按块读取时每块的字节数
+BLOCK_SIZE = 1 << 20
+# 一次归并最多同时打开的有序段文件数，超过时分多轮归并
+MAX_MERGE_FILES = 64
+
+
+def split_line_ranges(file_path, parts, start=0, end=None):
+    """
+    把文件 [start, end) 字节区间切成约parts段，每段边界对齐到换行符之后
+
+    参数：
+    file_path -- 文件路径
+    parts -- 期望的段数
+    start -- 起始字节位置（需在行首），默认为文件开头
+    end -- 结束字节位置，默认为文件末尾
+
+    返回：
+    list -- [(start, end), ...] 字节区间，左闭右开
+    """
+    end = os.path.getsize(file_path) if end is None else end
+    boundaries = [start]
+    with open(file_path, 'rb') as file:
+        for i in range(1, parts):
+            offset = max(start + (end - start) * i // parts, boundaries[-1])
+            if offset >= end:
+                break
+            file.seek(offset)
+            file.readline()  # 跳到下一行开头
+            offset = file.tell()
+            if offset >= end:
+                break
+            if offset > boundaries[-1]:
+                boundaries.append(offset)
+    boundaries.append(end)
+    return [(boundaries[i], boundaries[i + 1]) for i in range(len(boundaries) - 1)]
+
+
+def iter_line_blocks(file_path, start, end, block_size=BLOCK_SIZE):
+    """
+    按块读取文件 [start, end) 字节区间，每次产出约block_size字节的bytes，
+    块尾不完整的行留给下一块，所以每块都以换行符结束（区间末尾没有换行的最后一块除外）
+    """
+    rest = b""
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = file.read(min(block_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            data = rest + data
+            if remaining > 0:
+                cut = data.rfind(b"\n") + 1
+                rest = data[cut:]
+                data = data[:cut]
+            else:
+                rest = b""
+            if data:
+                yield data
+    if rest:
+        yield rest
+
+
+class RunCodec:
+    """
+    有序段文件的编解码方式：encode(记录) 返回包含换行符的一行，decode(一行) 还原出记录，
+    binary 为True时按二进制读写（encode/decode 处理 bytes），否则按UTF-8文本读写
+    """
+    __slots__ = ("encode", "decode", "binary")
+
+    def __init__(self, encode, decode, binary=False):
+        self.encode = encode
+        self.decode = decode
+        self.binary = binary
+
+    def open(self, path, mode):
+        if self.binary:
+            return open(path, mode + 'b')
+        return open(path, mode, encoding='utf-8')
+
+
+def write_run(records, run_dir, run_index, codec):
+    """
+    把排好序的记录写成一个有序段文件，每条记录一行（逐行写出，不拼接整段的大字符串）
+
+    参数：
+    records -- 排好序的记录（可以是迭代器）
+    run_dir -- 有序段文件所在目录
+    run_index -- 有序段编号，用于生成文件名
+    codec -- 记录的编解码方式（RunCodec）
+
+    返回：
+    str -- 有序段文件路径
+    """
+    path = os.path.join(run_dir, f"run_{run_index}.{'bin' if codec.binary else 'txt'}")
+    with codec.open(path, 'w') as file:
+        file.writelines(map(codec.encode, records))
+    return path
+
+
+def read_run(file, codec):
+    """
+    逐行读取已打开的有序段文件，产出记录
+    """
+    return map(codec.decode, file)
+
+
+@contextmanager
+def open_runs(paths, codec):
+    """
+    同时打开多个有序段文件，返回各自的记录迭代器列表，with 结束时关闭所有文件
+    """
+    files = [codec.open(path, 'r') for path in paths]
+    try:
+        yield [read_run(file, codec) for file in files]
+    finally:
+        for file in files:
+            file.close()
+
+
+def merge_runs(paths, run_dir, run_index, key, codec):
+    """
+    把多个有序段按key归并成一个新的有序段，删除原来的文件，返回新文件路径
+    """
+    with open_runs(paths, codec) as runs:
+        out_path = write_run(heapq.merge(*runs, key=key), run_dir, run_index, codec)
+    for path in paths:
+        os.remove(path)
+    return out_path
+
+
+def reduce_runs(runs, run_dir, run_index, key, codec, max_files=MAX_MERGE_FILES):
+    """
+    有序段太多时分多轮归并，每次最多同时打开max_files个文件，直到剩下的段数不超过max_files
+
+    参数：
+    runs -- 有序段文件路径列表
+    run_dir -- 有序段文件所在目录
+    run_index -- 新生成的有序段从这个编号开始命名（不能与已有的段重名）
+    key -- 记录的排序键
+    codec -- 记录的编解码方式（RunCodec）
+    max_files -- 一次归并最多同时打开的文件数
+
+    返回：
+    list -- 剩下的有序段文件路径，按原来的先后顺序排列（heapq.merge 是稳定的，键相同的记录保持先后顺序）
+    """
+    while len(runs) > max_files:
+        merged = []
+        for i in range(0, len(runs), max_files):
+            group = runs[i:i + max_files]
+            if len(group) == 1:
+                merged.append(group[0])
+            else:
+                merged.append(merge_runs(group, run_dir, run_index, key, codec))
+                run_index += 1
+        runs = merged
+    return runs
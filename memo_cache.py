@@ -0,0 +1,272 @@
+'''
+通用记忆化（memoization）装饰器：替代 @lru_cache(maxsize=None)，缓存有上限、可统计、可持久化
+
+功能：
+1. 按条目数（maxsize）和字节数（max_bytes）限制缓存大小，超出后按 LRU 或 LFU 策略淘汰
+2. 统计命中（hits）、未命中（misses）、淘汰（evictions）、磁盘命中（disk_hits）次数
+3. 可选的磁盘缓存层（shelve），进程重启后已计算过的结果仍然可以直接读取
+
+用法：
+    @memoize(maxsize=1024, policy='lru')
+    def f(x): ...
+
+    f.cache_info()            # 查看统计信息
+    f.cache_clear()           # 清空内存缓存
+    f.cache_persist(path)     # 打开磁盘缓存层
+    f.cache_close()           # 关闭磁盘缓存层（程序退出时会自动关闭）
+
+知识点：
+1. 装饰器：接收函数并返回新函数，@memoize(...) 是带参数的装饰器，相当于 f = memoize(...)(f)
+2. functools.wraps：把原函数的名字、文档等信息复制到包装函数上，
+   这样 pickle 仍然能按 "模块.函数名" 找到它（多进程传函数时需要）
+3. collections.OrderedDict：记住插入顺序的字典
+   - move_to_end(key)：把 key 移到末尾，表示"最近使用"
+   - popitem(last=False)：弹出最前面的元素，即"最久未使用"的元素
+4. LRU（最近最少使用）淘汰最久没有访问的条目；LFU（最不经常使用）淘汰访问次数最少的条目，
+   这里按访问次数分桶，每个桶是一个 OrderedDict，淘汰时从最小次数的桶里取最旧的；
+   命中和插入都是 O(1)，只有按字节数连续淘汰多条、把最小次数的桶取空时，才需要扫描一遍桶找新的最小次数
+   新条目要先腾出位置再放入：新条目的访问次数是1，如果先放入再淘汰，缓存里全是热点条目时它总是被立刻淘汰
+5. sys.getsizeof()：返回对象本身占用的字节数，大整数会随位数增长，用于估算缓存占用
+6. shelve 模块：像字典一样使用的持久化存储，key 必须是字符串，value 会被 pickle 保存到磁盘
+7. atexit.register()：注册程序退出时执行的函数，用来关闭磁盘文件
+'''
+
+import atexit
+import shelve
+import sys
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "disk_hits", "maxsize", "currsize", "nbytes"])
+
+POLICIES = ("lru", "lfu")
+
+
+class _KwargsMark:
+    """
+    缓存键中分隔位置参数和关键字参数的标记，repr固定，保证磁盘层的键在不同进程中一致
+    """
+
+    def __repr__(self):
+        return "<kwargs>"
+
+
+_KWARGS_MARK = _KwargsMark()
+
+
+# 只有一个这些类型的位置参数时直接用参数本身做键（同 functools._make_key），其他情况一律用参数元组，
+# 否则 f((1, 2)) 和 f(1, 2) 会得到同一个键
+_FAST_TYPES = {int, str}
+
+
+def _disk_key(key):
+    """
+    磁盘层使用的字符串键；整数（包括元组里的整数）用十六进制，避免超长整数转十进制字符串时报错
+    """
+    if type(key) is int:
+        return hex(key)
+    if type(key) is tuple:
+        return "(" + "".join(_disk_key(item) + ", " for item in key) + ")"
+    return repr(key)
+
+
+def _sizeof(obj):
+    """
+    估算对象占用的字节数，元组会把元素也算上
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, tuple):
+        size += sum(_sizeof(item) for item in obj)
+    return size
+
+
+class MemoCache:
+    """
+    带上限的缓存：条目数和字节数任意一个超限就按策略淘汰
+
+    参数：
+    maxsize -- 最多缓存的条目数，None表示不限制
+    max_bytes -- 最多占用的字节数（按 sys.getsizeof 估算），None表示不限制
+    policy -- 淘汰策略，'lru' 或 'lfu'
+    """
+
+    def __init__(self, maxsize=128, max_bytes=None, policy="lru"):
+        if policy not in POLICIES:
+            raise ValueError(f"policy 只能是 {POLICIES} 之一: {policy}")
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize need greater than 0")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._disk = None
+        self.clear()
+
+    def clear(self):
+        """
+        清空内存中的缓存和统计（不影响磁盘缓存层）
+        """
+        self._data = OrderedDict()  # key -> (value, size)，LRU 时顺序就是访问顺序
+        self._freq = {}  # LFU：key -> 访问次数
+        self._buckets = {}  # LFU：访问次数 -> OrderedDict(key -> None)
+        self._min_freq = 0
+        self.hits = self.misses = self.evictions = self.disk_hits = 0
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _touch(self, key):
+        """
+        记录一次访问，更新 LRU 顺序或 LFU 计数
+        """
+        if self.policy == "lru":
+            self._data.move_to_end(key)
+            return
+        freq = self._freq[key]
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._freq[key] = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def _evict_one(self):
+        if self.policy == "lru":
+            _, (_, size) = self._data.popitem(last=False)
+        else:
+            # 上一次淘汰可能把最小次数的桶取空了，这时才重新找最小次数
+            if self._min_freq not in self._buckets:
+                self._min_freq = min(self._buckets)
+            bucket = self._buckets[self._min_freq]
+            key, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self._buckets[self._min_freq]
+            del self._freq[key]
+            _, size = self._data.pop(key)
+        self.nbytes -= size
+        self.evictions += 1
+
+    def _over_budget(self, size):
+        """
+        再放入一个占用size字节的新条目后是否会超限
+        """
+        if self.maxsize is not None and len(self._data) + 1 > self.maxsize:
+            return True
+        return self.max_bytes is not None and self.nbytes + size > self.max_bytes
+
+    def get(self, key, default=None):
+        """
+        查找缓存，先查内存，再查磁盘层；命中时更新统计
+
+        参数：
+        key -- 缓存键
+        default -- 未命中时的返回值
+
+        返回：
+        缓存的值或default
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._touch(key)
+            return entry[0]
+        if self._disk is not None:
+            disk_key = _disk_key(key)
+            if disk_key in self._disk:
+                value = self._disk[disk_key]
+                self.disk_hits += 1
+                self._put_memory(key, value)
+                return value
+        self.misses += 1
+        return default
+
+    def _put_memory(self, key, value):
+        if key in self._data:
+            return
+        size = _sizeof(key) + _sizeof(value)
+        # 先腾出位置再放入，新条目总能进入缓存（单个超大值也至少保留这一条）
+        while self._data and self._over_budget(size):
+            self._evict_one()
+        self._data[key] = (value, size)
+        self.nbytes += size
+        if self.policy == "lfu":
+            self._freq[key] = 1
+            self._buckets.setdefault(1, OrderedDict())[key] = None
+            self._min_freq = 1
+
+    def put(self, key, value):
+        """
+        写入缓存，同时写入磁盘层（如果已打开）
+        """
+        self._put_memory(key, value)
+        if self._disk is not None:
+            self._disk[_disk_key(key)] = value
+
+    def persist(self, path):
+        """
+        打开磁盘缓存层，之后新算出的结果都会写到磁盘，下次启动可以直接读取
+
+        参数：
+        path -- shelve 文件路径（可能会生成多个带扩展名的文件）
+        """
+        self.close()
+        self._disk = shelve.open(path)
+        atexit.register(self.close)
+
+    def close(self):
+        """
+        关闭磁盘缓存层
+        """
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions, self.disk_hits,
+                         self.maxsize, len(self._data), self.nbytes)
+
+
+def memoize(maxsize=128, max_bytes=None, policy="lru", persist_path=None):
+    """
+    带参数的记忆化装饰器
+
+    参数：
+    maxsize -- 最多缓存的条目数，None表示不限制
+    max_bytes -- 最多占用的字节数，None表示不限制
+    policy -- 淘汰策略，'lru' 或 'lfu'
+    persist_path -- 磁盘缓存层的文件路径，None表示只用内存
+
+    返回：
+    function -- 装饰器
+    """
+    def decorator(func):
+        cache = MemoCache(maxsize, max_bytes, policy)
+        if persist_path:
+            cache.persist(persist_path)
+        missing = object()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # 只有一个 int/str 位置参数时直接用参数做键，和 lru_cache 一样省掉元组
+            if kwargs:
+                key = args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+            elif len(args) == 1 and type(args[0]) in _FAST_TYPES:
+                key = args[0]
+            else:
+                key = args
+            value = cache.get(key, missing)
+            if value is missing:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_persist = cache.persist
+        wrapper.cache_close = cache.close
+        return wrapper
+
+    return decorator
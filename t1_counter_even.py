@@ -5,16 +5,130 @@
 # 语法：range(start, stop[, step])，参数说明：
 # start: 计数从 start 开始。默认是从 0 开始。例如range（5）等价于range（0， 5）;
 # stop: 计数到 stop 结束，但不包括 stop。例如：range（0， 5） 是[0, 1, 2, 3, 4]没有5
+# 等差数列求和公式：首项a1、末项an、项数k，和为 (a1 + an) * k / 2，不需要逐个累加，O(1) 就能算出
+# 区间 [start, stop) 内step的倍数：首项为不小于start的第一个倍数 -(-start // step) * step，
+# 末项为小于stop的最后一个倍数 (stop - 1) // step * step
+# 任意条件（predicate）无法用公式时逐个判断后求和；predicate 支持整数数组时可以传 vectorized=True，
+# 按块生成数组，用 NumPy 向量化判断；没有安装 NumPy、或返回值不是和输入同形状的数组时退回纯Python循环
+# 批量查询：把所有查询的端点排序，相邻端点之间的小段只算一次，再用前缀和回答每个查询
+
+from bisect import bisect_left
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖
+    np = None
+
+# 向量化计算时每块包含的元素个数
+CHUNK_SIZE = 1 << 20
+
+
+def _check_step(step):
+    if step <= 0:
+        raise ValueError("step need greater than 0")
+
+
+def _series_sum(start, stop, step):
+    """
+    等差数列公式：[start, stop) 中所有step倍数的和
+    """
+    first = -(-start // step) * step
+    last = (stop - 1) // step * step
+    if first > last:
+        return 0
+    count = (last - first) // step + 1
+    return (first + last) * count // 2
+
+
+def _predicate_sum(start, stop, step, predicate, chunk_size, vectorized=False):
+    """
+    对 [start, stop) 中满足predicate的step倍数求和，按块计算；
+    vectorized为True时把整块作为int64数组传给predicate
+    """
+    first = -(-start // step) * step
+    if first >= stop:
+        return 0
+    # 块内的值和块的和都要放得进 int64，否则退回纯Python
+    use_numpy = vectorized and np is not None and max(abs(first), abs(stop)) * chunk_size < 1 << 63
+    total = 0
+    span = chunk_size * step
+    for low in range(first, stop, span):
+        high = min(low + span, stop)
+        if use_numpy:
+            values = np.arange(low, high, step, dtype=np.int64)
+            mask = np.asarray(predicate(values), dtype=bool)
+            if mask.shape == values.shape:
+                total += int(values[mask].sum())
+                continue
+            # 返回的不是逐个元素的判断结果（例如只返回了一个真假值），这一块及之后都逐个判断
+            use_numpy = False
+        total += sum(x for x in range(low, high, step) if predicate(x))
+    return total
+
+
+def sum_multiples(start, stop, step=1, predicate=None, chunk_size=CHUNK_SIZE, vectorized=False):
+    """
+    求区间 [start, stop) 中所有step的倍数之和，可以再用predicate筛选
+
+    参数：
+    start -- 区间起点（包含）
+    stop -- 区间终点（不包含）
+    step -- 只统计step的倍数，正整数
+    predicate -- 额外的筛选条件，接收一个整数返回真假，例如 lambda x: x % 3 == 1；为None时直接用等差数列公式
+    chunk_size -- predicate求和时每块的元素个数
+    vectorized -- predicate 也能接收整数数组并返回同形状的布尔数组时设为True，安装了NumPy就按块向量化计算
+
+    返回：
+    int -- 求和结果
+    """
+    _check_step(step)
+    if predicate is None:
+        return _series_sum(start, stop, step)
+    return _predicate_sum(start, stop, step, predicate, chunk_size, vectorized)
+
+
+def sum_multiples_batch(queries, step=1, predicate=None, chunk_size=CHUNK_SIZE, vectorized=False):
+    """
+    一次回答多个 [start, stop) 区间求和查询，重叠部分只计算一次
+
+    参数：
+    queries -- (start, stop) 元组的列表
+    step -- 只统计step的倍数，正整数
+    predicate -- 额外的筛选条件，同 sum_multiples
+    chunk_size -- predicate求和时每块的元素个数
+    vectorized -- predicate 是否支持整数数组，同 sum_multiples
+
+    返回：
+    list -- 与queries顺序一致的求和结果
+    """
+    _check_step(step)
+    queries = [(start, stop) if start < stop else (start, start) for start, stop in queries]
+    if predicate is None:
+        return [_series_sum(start, stop, step) for start, stop in queries]
+
+    points = sorted({point for query in queries for point in query})
+    # 差分数组统计每个小段被多少个查询覆盖，没被覆盖的小段不用计算
+    cover = [0] * len(points)
+    for start, stop in queries:
+        cover[bisect_left(points, start)] += 1
+        cover[bisect_left(points, stop)] -= 1
+    cover = list(accumulate(cover))
+    segment_sums = [
+        _predicate_sum(points[i], points[i + 1], step, predicate, chunk_size, vectorized) if cover[i] else 0
+        for i in range(len(points) - 1)
+    ]
+    prefix = [0] + list(accumulate(segment_sums))
+    return [prefix[bisect_left(points, stop)] - prefix[bisect_left(points, start)] for start, stop in queries]
+
+
 def counter_even(num):
     if(num==0):
         return 0
-    sum=0
-    for i in range(1,num+1):
-        if(i%2==0):
-            sum+=i
-    return sum
+    # 1到num的偶数和，就是 [1, num+1) 中2的倍数之和
+    return sum_multiples(1, num + 1, 2)
 
 if __name__=="__main__":
     print(counter_even(10))
 
-    
\ No newline at end of file
+    
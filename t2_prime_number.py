@@ -11,28 +11,311 @@
 #    如果一个数不是质数，那么它一定可以被2到它的平方根之间的某个数整除。
 #    代码： for j in range(2, int(i**0.5) + 1):
 # 6、幂运算： i**0.5 等价于 math.sqrt(i)，i**3 等价于 i * i * i
+# 7、分段埃拉托斯特尼筛法（Segmented Sieve of Eratosthenes）：
+#    - 先用普通筛法求出 sqrt(n) 以内的"基础质数"，再把 [2, n] 切成固定大小的段逐段筛
+#    - 每段只用一个 bytearray 标记奇数（偶数除2以外都不是质数，直接跳过），内存只和段大小有关
+#    - 段大小取几百KB，可以放进CPU缓存，比一次性开 n 大小的数组更快
+#    - 切片赋值 seg[start::p] = bytes(k) 一次清掉一整串倍数，比 for 循环快得多
+#    - itertools.compress(data, selectors)：按 selectors 中为真的位置挑出 data 中的元素
+# 8、生成器（yield）：
+#    - 函数中使用 yield 就变成生成器，调用时不会立即执行，而是每次 next() 时产出一个值
+#    - yield from 可以把另一个可迭代对象的元素逐个产出
+#    - 生成器一边计算一边输出，不需要先把全部结果存到列表里，适合处理很大的区间
+#    - bytearray.count(1)：统计段中质数标记的个数，只计数时不用真正生成质数
+# 9、大整数的质数判断：
+#    - 试除到 sqrt(n) 对几十位的大数也太慢，要用概率素数测试
+#    - Miller-Rabin：把 n-1 写成 d*2^s，用 pow(a, d, n) 快速幂检查，n < 2^64 时取前12个质数做底数结果是确定的
+#    - BPSW：底数2的 Miller-Rabin 再加一次强 Lucas 测试，任意大小的整数都可以用，至今没有找到反例
+#    - pow(a, d, n)：三参数的 pow 直接做模幂运算，不会先算出巨大的 a**d
+#    - 大数判断比较耗时，用 memo_cache.memoize 缓存结果（按次数和字节数限制大小，LFU淘汰）
+
+import math
+from itertools import compress
+
+from memo_cache import memoize
+
+# 每段覆盖的奇数个数（即 bytearray 的长度），256KB 左右可以放进 L2 缓存
+SEGMENT_SIZE = 1 << 18
+
+
+def _base_primes(limit):
+    """
+    普通埃氏筛，返回小于等于limit的所有奇质数（不含2），供分段筛使用
+
+    参数：
+    limit -- 上界
+
+    返回：
+    list -- 奇质数列表
+    """
+    if limit < 3:
+        return []
+    # sieve[i] 表示奇数 2*i+1 是否为质数
+    size = (limit - 1) // 2 + 1
+    sieve = bytearray([1]) * size
+    sieve[0] = 0  # 1不是质数
+    for i in range(1, (math.isqrt(limit) - 1) // 2 + 1):
+        if sieve[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            sieve[start::p] = bytes(len(range(start, size, p)))
+    return list(compress(range(1, limit + 1, 2), sieve))
+
+
+def _sieve_segment(low, high, base_primes):
+    """
+    筛出区间 [low, high) 中的奇数质数标记，low 必须是奇数
+
+    参数：
+    low -- 区间起点（奇数）
+    high -- 区间终点（不包含）
+    base_primes -- 不小于 sqrt(high) 的奇质数表
+
+    返回：
+    bytearray -- seg[i] 为1表示 low+2*i 是质数
+    """
+    size = (high - low + 1) // 2
+    seg = bytearray([1]) * size
+    for p in base_primes:
+        pp = p * p
+        if pp >= high:
+            break
+        # 找到段内第一个需要划掉的奇数倍数：不小于p*p，且是p的奇数倍
+        start = max(pp, (low + p - 1) // p * p)
+        if start % 2 == 0:
+            start += p
+        idx = (start - low) // 2
+        if idx < size:
+            seg[idx::p] = bytes(len(range(idx, size, p)))
+    if low == 1:
+        seg[0] = 0  # 1不是质数
+    return seg
+
+
+def _sieve_segments(start, stop, segment_size=SEGMENT_SIZE):
+    """
+    把 [start, stop) 中的奇数切成若干段逐段筛（生成器），每次只持有一段的 bytearray
+
+    参数：
+    start -- 区间起点（包含）
+    stop -- 区间终点（不包含）
+    segment_size -- 每段包含的奇数个数
+
+    返回：
+    generator -- 依次产出 (low, high, seg)，seg[i] 为1表示 low+2*i 是质数
+    """
+    low = max(start, 1) | 1  # 从不小于start的第一个奇数开始
+    if low >= stop:
+        return
+    base_primes = _base_primes(math.isqrt(stop - 1))
+    span = 2 * segment_size
+    for seg_low in range(low, stop, span):
+        seg_high = min(seg_low + span, stop)
+        yield seg_low, seg_high, _sieve_segment(seg_low, seg_high, base_primes)
+
+
+def iter_primes(start, stop, segment_size=SEGMENT_SIZE):
+    """
+    惰性产出区间 [start, stop) 内的所有质数（生成器），内存只和段大小有关，和区间大小无关
+    例如 iter_primes(10**12, 10**12 + 10**7) 可以边筛边输出
+
+    参数：
+    start -- 区间起点（包含）
+    stop -- 区间终点（不包含）
+    segment_size -- 每段包含的奇数个数
+
+    返回：
+    generator -- 质数生成器
+    """
+    if start <= 2 < stop:
+        yield 2
+    for low, high, seg in _sieve_segments(start, stop, segment_size):
+        yield from compress(range(low, high, 2), seg)
+
+
+def count_primes(start, stop, segment_size=SEGMENT_SIZE):
+    """
+    只统计区间 [start, stop) 内质数的个数，不生成任何质数对象
+
+    参数：
+    start -- 区间起点（包含）
+    stop -- 区间终点（不包含）
+    segment_size -- 每段包含的奇数个数
+
+    返回：
+    int -- 质数个数
+    """
+    count = 1 if start <= 2 < stop else 0
+    for _, _, seg in _sieve_segments(start, stop, segment_size):
+        count += seg.count(1)
+    return count
+
+
+def segmented_sieve(n, segment_size=SEGMENT_SIZE):
+    """
+    分段筛法，按从小到大的顺序逐个产出小于等于n的质数（生成器）
+
+    参数：
+    n -- 上界（包含）
+    segment_size -- 每段包含的奇数个数
+
+    返回：
+    generator -- 质数生成器
+    """
+    return iter_primes(2, n + 1, segment_size)
 
 
 def prime_numbers(n):
     if(n<1):
         return []
-    prime_list = []
-    for i in range(2,n+1):
-        
-        if(is_prime(i)):
-            prime_list.append(i)
-    return prime_list
+    return list(segmented_sieve(n))
+
+# 试除用的小质数表，以及确定性 Miller-Rabin 在 n < 2^64 时使用的底数
+SMALL_PRIMES = (2,) + tuple(_base_primes(1000))
+MR_BASES_64 = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def _miller_rabin(n, bases):
+    """
+    强概率素数测试（Miller-Rabin），n 为大于2的奇数
+    把 n-1 写成 d*2^s，对每个底数 a 检查 a^d ≡ 1 或某个 a^(d*2^r) ≡ -1 (mod n)
+
+    参数：
+    n -- 待测奇数
+    bases -- 底数序列
+
+    返回：
+    bool -- 对所有底数都通过返回True，否则返回False
+    """
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _jacobi(a, n):
+    """
+    计算雅可比符号 (a/n)，n 为正奇数
+    """
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _half_mod(x, n):
+    """
+    计算 x/2 (mod n)，n 为奇数
+    """
+    x %= n
+    if x % 2:
+        x += n
+    return x // 2
+
+
+def _strong_lucas(n):
+    """
+    强 Lucas 概率素数测试（Selfridge 参数选择），n 为大于2的奇数且不是完全平方数
+
+    参数：
+    n -- 待测奇数
+
+    返回：
+    bool -- 通过测试返回True，否则返回False
+    """
+    # 在 5, -7, 9, -11, ... 中找第一个使 (D/n) = -1 的 D
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P = 1
+    Q = (1 - D) // 4
+
+    # n+1 = d*2^s
+    d = n + 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # 从最高位开始按二进制位计算 U_d, V_d 和 Q^d
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == '1':
+            U, V = _half_mod(P * U + V, n), _half_mod(D * U + P * V, n)
+            Qk = Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+@memoize(maxsize=4096, max_bytes=1 << 20, policy="lfu")
 def is_prime(n):
+    """
+    判断n是否为质数
+    1. 先用1000以内的小质数试除，能快速排除大部分合数
+    2. n < 2^64 时用固定底数的 Miller-Rabin，结果是确定的
+    3. 更大的整数用 BPSW（底数2的 Miller-Rabin + 强 Lucas 测试），目前没有已知的反例
+
+    参数：
+    n -- 待判断的整数
+
+    返回：
+    bool -- 是质数返回True，否则返回False
+    """
     if(n<=1):
         return False
-    for i in range(2,n):
-        if(n%i==0):
-            return False
-    return True
+    for p in SMALL_PRIMES:
+        if(n%p==0):
+            return n==p
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+    if n < 1 << 64:
+        return _miller_rabin(n, MR_BASES_64)
+    if not _miller_rabin(n, (2,)):
+        return False
+    if math.isqrt(n) ** 2 == n:
+        return False
+    return _strong_lucas(n)
 
 if __name__=="__main__":
     n=(int(input("put a number: ")))
-    prime_list=prime_numbers(n)
-    print(f"prime numbers: {len(prime_list)}")
-    for item in prime_list:
+    # 先只计数，再流式输出，不需要一次性把所有质数放进列表
+    print(f"prime numbers: {count_primes(2, n + 1)}")
+    for item in iter_primes(2, n + 1):
         print(f"{item} ")
@@ -19,27 +19,172 @@
 #    作用：缓存函数的结果，避免重复计算，提高程序性能
 #    导入： from functools import lru_cache
 #    语法：@lru_cache(maxsize=None)，参数说明：maxsize：缓存的最大条目数，如果为None，则缓存大小没有限制
+# 5.快速倍增（fast doubling）：
+#    F(2k) = F(k) * (2*F(k+1) - F(k))，F(2k+1) = F(k)^2 + F(k+1)^2
+#    按n的二进制位从高到低迭代，只需要 O(log n) 次乘法，也没有递归深度的问题
+#    递归版本递归深度是n，n到1000左右就会触发 RecursionError
+# 6.矩阵快速幂：
+#    [[1,1],[1,0]]^n = [[F(n+1),F(n)],[F(n),F(n-1)]]，用平方-乘法求矩阵幂同样是 O(log n)
+# 7.有上限的缓存：
+#    lru_cache(maxsize=None) 在长时间运行的进程里会无限增长，这里改用 memo_cache.memoize，
+#    限制条目数并统计命中率（cache_info），还可以用 cache_persist 把结果保存到磁盘，重启后继续使用
+# 8.模运算下的斐波那契：
+#    每一步都对m取模，数字不会变大；F(n) mod m 的序列是周期性的（皮萨诺周期），可用 fib_mod 验证
+# 9.生成器与分块输出：
+#    iter_fib 用 yield 逐项产出，调用方可以边算边用；write_chunked 每攒够 chunk_size 项才 join 并写一次，
+#    不需要先拼出一个包含全部项的超长字符串
+#    time.perf_counter()：高精度计时，把"计算耗时"和"输出耗时"分开统计
+#    Python 3.11 起超过4300位的整数默认不能转成字符串，可用 sys.set_int_max_str_digits(0) 取消限制
 
 
 
 
 
+import sys
 import time
-from functools import lru_cache
+from itertools import islice
 
-def iterative_fib(num):
+from memo_cache import memoize
+
+# 分块输出时每块包含的项数
+CHUNK_SIZE = 1000
+
+
+def iter_fib(num):
+    """
+    惰性产出斐波那契数列前num项（生成器）
+
+    参数：
+    num -- 项数
+
+    返回：
+    generator -- 依次产出 F(0), F(1), ..., F(num-1)
+    """
     if num < 0:
         raise ValueError("num need greater than 0")
-    
-    a,b=0,1
-    fbi_lis=[]
+    a, b = 0, 1
     for _ in range(num):
-        fbi_lis.append(a)
-        a,b=b,a+b
-    print("fbi list:", ', '.join(map(str,fbi_lis)))
+        yield a
+        a, b = b, a + b
+
+
+def write_chunked(terms, out, chunk_size=CHUNK_SIZE, sep=", "):
+    """
+    把数列按固定大小分块写到文件或管道，每次只拼接一块的字符串
+
+    参数：
+    terms -- 可迭代的数列，例如 iter_fib(num)
+    out -- 有write方法的文件对象，如 sys.stdout 或 open() 返回的文件
+    chunk_size -- 每块的项数
+    sep -- 分隔符
+
+    返回：
+    int -- 写出的项数
+    """
+    terms = iter(terms)
+    count = 0
+    while True:
+        chunk = list(islice(terms, chunk_size))
+        if not chunk:
+            break
+        if count:
+            out.write(sep)
+        out.write(sep.join(map(str, chunk)))
+        count += len(chunk)
+    return count
+
+
+def iterative_fib(num):
+    """
+    迭代计算斐波那契数列前num项
+
+    参数：
+    num -- 项数
+
+    返回：
+    list -- 前num项组成的列表
+    """
+    return list(iter_fib(num))
+
+
+def _fib_pair(num, mod=None):
+    """
+    快速倍增法计算 (F(num), F(num+1))，mod不为None时所有结果对mod取模
+    """
+    a, b = 0, 1  # F(0), F(1)
+    for bit in bin(num)[2:]:
+        c = a * (2 * b - a)  # F(2k)
+        d = a * a + b * b  # F(2k+1)
+        if bit == '1':
+            a, b = d, c + d
+        else:
+            a, b = c, d
+        if mod is not None:
+            a, b = a % mod, b % mod
+    return a, b
+
+
+def fib(num):
+    """
+    快速倍增法计算第num项斐波那契数，F(10**6) 也能很快算出
+
+    参数：
+    num -- 项数，从第0项开始
+
+    返回：
+    int -- F(num)
+    """
+    if num < 0:
+        raise ValueError("num need greater than 0")
+    return _fib_pair(num)[0]
+
+
+def fib_mod(num, mod):
+    """
+    计算 F(num) mod mod，中间结果始终小于mod，可用于皮萨诺周期相关的计算
+
+    参数：
+    num -- 项数，从第0项开始
+    mod -- 模数，正整数
+
+    返回：
+    int -- F(num) % mod
+    """
+    if num < 0:
+        raise ValueError("num need greater than 0")
+    if mod < 1:
+        raise ValueError("mod need greater than 0")
+    return _fib_pair(num, mod)[0] % mod
+
+
+def fib_matrix(num):
+    """
+    矩阵快速幂计算第num项斐波那契数：[[1,1],[1,0]]^num 的右上角就是 F(num)
+
+    参数：
+    num -- 项数，从第0项开始
+
+    返回：
+    int -- F(num)
+    """
+    if num < 0:
+        raise ValueError("num need greater than 0")
+
+    def multiply(x, y):
+        return (x[0] * y[0] + x[1] * y[2], x[0] * y[1] + x[1] * y[3],
+                x[2] * y[0] + x[3] * y[2], x[2] * y[1] + x[3] * y[3])
+
+    result = (1, 0, 0, 1)  # 单位矩阵，按 (左上, 右上, 左下, 右下) 存储
+    base = (1, 1, 1, 0)
+    while num:
+        if num & 1:
+            result = multiply(result, base)
+        base = multiply(base, base)
+        num >>= 1
+    return result[1]
 
 
-@lru_cache(maxsize=None)
+@memoize(maxsize=1024)
 def recursive_fib(num):
     if num < 0:
         raise ValueError("num need greater than 1")
@@ -50,19 +195,34 @@ def recursive_fib(num):
 
 if __name__=="__main__":
     n=(int(input("input a num : ")))
-    # 统计迭代耗时
-    start_time = time.time()
+    if hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)
+    # 统计迭代耗时，计算和输出分开计时
+    start_time = time.perf_counter()
     iter_result = iterative_fib(n)
-    print(f"迭代耗时: {time.time() - start_time:.4f}秒")
+    compute_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    sys.stdout.write("fbi list: ")
+    write_chunked(iter_result, sys.stdout)
+    sys.stdout.write("\n")
+    output_time = time.perf_counter() - start_time
+    print(f"迭代计算耗时: {compute_time:.4f}秒, 输出耗时: {output_time:.4f}秒")
     
-    # 统计递归耗时
+    # 统计递归耗时，缓存保存到磁盘，下次运行直接命中
     print("===================")
+    recursive_fib.cache_persist("./output/t3_fib_cache")
     try:
-        start_time = time.time()
+        start_time = time.perf_counter()
         recur_list = [recursive_fib(i) for i in range(0, n)]
-        print(f"递归结果: {', '.join(map(str, recur_list))}")
-        print(f"递归耗时: {time.time() - start_time:.4f}秒")
+        compute_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        sys.stdout.write("递归结果: ")
+        write_chunked(recur_list, sys.stdout)
+        sys.stdout.write("\n")
+        output_time = time.perf_counter() - start_time
+        print(f"递归计算耗时: {compute_time:.4f}秒, 输出耗时: {output_time:.4f}秒")
     except ValueError as e:
         print(f"错误: {e}")
     finally:
-        recursive_fib.cache_clear()
\ No newline at end of file
+        print(f"缓存统计: {recursive_fib.cache_info()}")
+        recursive_fib.cache_close()
@@ -3,21 +3,92 @@
 # 1. 斐波那契数列生成（复用3fbi_list.py）
 # 2. 质数判断（复用2prime_number.py）
 # 3. 结果筛选与性能统计
+# 4. 下标筛选：F(m) 能整除 F(km)，所以下标k是合数时 F(k) 一定不是质数（唯一例外 F(4)=3），
+#    只需要检查质数下标，大部分质数判断都可以省掉
+# 5. 快速倍增（fast doubling，复用3fbi_list.py中的fib）：
+#    按下标的二进制位从高到低计算，O(log k) 次乘法就能直接得到 F(k)，不需要从头逐项累加
+# 6. 函数作为参数：把质数判断函数通过参数传进来，可以随时替换成别的实现
+# 7. 多进程并行：
+#    - 大整数的质数判断是纯CPU计算，且每个下标之间互不影响，适合用 concurrent.futures.ProcessPoolExecutor 分给多个进程
+#    - 受GIL限制，多线程无法并行执行Python计算，所以这里用进程而不是线程
+#    - executor.submit() 返回 Future 对象，按提交顺序依次取 result()，结果顺序就和串行一致
+#    - 只保留固定数量（窗口大小）的未完成任务，找够n个后取消其余任务，避免多算太多
+#    - 传给子进程的函数必须能被 pickle，所以要定义在模块顶层
 
-from t2_prime_number import is_prime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
-def generate_fib_primes(n):
+from t2_prime_number import is_prime, iter_primes
+from t3_fbi_list import fib
+
+
+def _prime_indices():
+    """
+    产出可能让 F(k) 为质数的下标：4 和所有不小于3的质数（F(2)=1 不是质数）
+    """
+    yield 3
+    yield 4
+    low = 5
+    while True:
+        yield from iter_primes(low, 2 * low)
+        low *= 2
+
+
+def _check_index(k, primality_test):
+    """
+    在子进程中计算 F(k) 并判断是否为质数，是质数返回 F(k)，否则返回None
+    """
+    candidate = fib(k)
+    return candidate if primality_test(candidate) else None
+
+
+def _generate_fib_primes_parallel(n, primality_test, workers, window):
+    """
+    多进程版本：最多同时保留window个未完成的下标任务，按下标顺序收集结果
+    """
+    fib_list = []
+    indices = _prime_indices()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque(executor.submit(_check_index, k, primality_test) for k in islice(indices, window))
+        while pending:
+            candidate = pending.popleft().result()
+            if candidate is not None:
+                fib_list.append(candidate)
+                if len(fib_list) >= n:
+                    break
+            pending.append(executor.submit(_check_index, next(indices), primality_test))
+        # 找够了就取消还没开始的任务，已经在运行的任务会等它结束
+        for future in pending:
+            future.cancel()
+    return fib_list
+
+
+def generate_fib_primes(n, primality_test=is_prime, workers=None, window=None):
     """
     生成前n个既是斐波那契数又是质数的数字，因为斐波那契数的增长速度非常快，所以斐波那契数来筛选
-    返回：（结果列表，迭代耗时，筛选耗时）
+    只检查质数下标的斐波那契数，用快速倍增直接跳到 F(k)
+
+    参数：
+    n -- 需要的斐波那契质数个数
+    primality_test -- 质数判断函数，默认使用 t2_prime_number.is_prime（多进程时必须是模块顶层函数）
+    workers -- 进程数，大于1时用进程池并行判断，默认串行
+    window -- 并行时最多提前提交的下标个数，默认是进程数的2倍
+
+    返回：
+    list -- 前n个斐波那契质数
     """
-    # 生成斐波那契数列
     fib_list = []
-    a, b = 0, 1
-    while len(fib_list) < n:
-        if(is_prime(a)):
-            fib_list.append(a)
-        a,b=b,a+b
+    if n <= 0:
+        return fib_list
+    if workers and workers > 1:
+        return _generate_fib_primes_parallel(n, primality_test, workers, window or 2 * workers)
+    for k in _prime_indices():
+        candidate = fib(k)
+        if primality_test(candidate):
+            fib_list.append(candidate)
+            if len(fib_list) >= n:
+                break
     return fib_list
 
 if __name__=="__main__":
@@ -26,4 +97,4 @@ if __name__=="__main__":
         res_list=generate_fib_primes(n)
         print(f"fib primes list : { ', '.join(map(str,res_list)) }")
     except ValueError as e:
-        print(f"generate_fib_primes error: {e}",e)
\ No newline at end of file
+        print(f"generate_fib_primes error: {e}",e)
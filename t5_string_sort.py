@@ -30,15 +30,198 @@
 #    - 用指定的分隔符将字符串列表中的元素连接成一个字符串
 #    - 语法：分隔符.join(列表)
 #    - 示例：" ".join(["a", "b"]) 返回 "a b"
+# 
+# 6. 按长度分桶排序：
+#    - 单词长度的种类很少，可以先按长度放进不同的"桶"（字典：长度 -> 单词列表）
+#    - 每个桶内只需要按字符串排序，再按长度从小到大把桶拼起来，结果和元组排序完全一样
+#    - 省掉了每个单词一个元组和一次lambda调用，单词越多优势越明显
+# 
+# 7. 外部排序（文件比内存还大时）：
+#    - 分块读取输入文件，内存中攒到预算上限就排好序写到临时文件（称为一个"有序段"run）
+#    - 最后用 heapq.merge() 对所有有序段做k路归并，每个文件同一时刻只需要读一行，内存占用与文件大小无关
+#    - 分块读取时一个单词可能被切成两半，要把块末尾不完整的部分留到下一块
+#    - 内存预算要覆盖整个过程的峰值，而不只是单词列表：有序段只用预算的一半，每次读取的块也按预算缩小；
+#      段内先 sort() 再按 len 稳定排序（sort(key=len)），结果和 (长度, 单词) 排序一样，但只需要一个指针大小的键数组，
+#      不像分桶那样再复制一份列表；写段文件和最终结果时都用 writelines() 逐个写出，不用 join 拼出大字符串
+#    - 每个打开的文件都有读缓冲区，归并时同时打开的文件数也按预算限制（最多 MAX_MERGE_FILES 个）
+#    - 有序段的读写和分轮归并（write_run / open_runs / reduce_runs）在 chunked_io 中，按排序键（key）和编解码方式（RunCodec）参数化，
+#      这里只提供单词的排序键和每行一个单词的编解码方式，t8_json_processor 的学生记录外部排序也使用这几个函数
+#    - tempfile.TemporaryDirectory()：临时目录，with 结束后自动删除
+
+
+import heapq
+import os
+import sys
+import tempfile
+
+from chunked_io import MAX_MERGE_FILES, RunCodec, open_runs, reduce_runs, write_run
+
+# 外部排序默认的内存预算（字节）和每次读取的字符数
+MEMORY_LIMIT = 64 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+# 内存中的有序段最多占预算的 1/RUN_SHARE，每次读取的块最多占 1/READ_SHARE，其余留给排序键、读取时的临时单词等
+RUN_SHARE = 2
+READ_SHARE = 64
+# 归并时每个打开的有序段文件大约占用的内存（读缓冲区 + 解码后的文本），用来按预算限制同时打开的文件数
+RUN_FILE_BYTES = 32 * 1024
+
+
+def _sort_by_key(words_list):
+    """
+    原来的写法：为每个单词生成 (长度, 单词) 元组作为排序键
+    """
+    return sorted(words_list,key=lambda str: (len(str),str))
 
 
-def sort_words(text):
+def _sort_by_bucket(words_list):
+    """
+    按长度分桶：同一长度的单词放进同一个列表，桶内直接按字符串排序，再按长度从小到大拼接
+    不需要为每个单词创建元组，也不需要调用lambda
+    """
+    buckets = {}
+    for word in words_list:
+        length = len(word)
+        if length in buckets:
+            buckets[length].append(word)
+        else:
+            buckets[length] = [word]
+    sorted_words = []
+    for length in sorted(buckets):
+        bucket = buckets[length]
+        bucket.sort()
+        sorted_words.extend(bucket)
+    return sorted_words
+
+
+SORT_METHODS = {
+    "bucket": _sort_by_bucket,
+    "key": _sort_by_key,
+}
+
+
+def sort_words(text, method="bucket"):
+    """
+    把单词按长度从短到长排序，长度相同按字母顺序排序
+
+    参数：
+    text -- 输入字符串
+    method -- 排序方式：'bucket' 按长度分桶（默认，更快），'key' 使用 (长度, 单词) 元组作为排序键
+
+    返回：
+    str -- 排序后用空格连接的字符串，两种方式结果完全相同
+    """
+    if method not in SORT_METHODS:
+        raise ValueError(f"method 只能是 {list(SORT_METHODS)} 之一: {method}")
     if not text.strip():
         return ""
-    # 在这里实现你的代码
     words_list = text.split()
-    sorted_words =  sorted(words_list,key=lambda str: (len(str),str))
-    return " ".join(sorted_words)
+    return " ".join(SORT_METHODS[method](words_list))
+
+def _word_key(word):
+    return len(word), word
+
+
+def _iter_words(file, read_size):
+    """
+    分块读取文件并逐个产出单词，处理被块边界切开的单词
+    """
+    rest = ""
+    while True:
+        chunk = file.read(read_size)
+        if not chunk:
+            break
+        chunk = rest + chunk
+        words = chunk.split()
+        # 块不是以空白结尾时，最后一个单词可能不完整，留到下一块
+        if words and not chunk[-1].isspace():
+            rest = words.pop()
+        else:
+            rest = ""
+        yield from words
+    if rest:
+        yield rest
+
+
+def _encode_word(word):
+    return word + "\n"
+
+
+def _decode_word(line):
+    return line[:-1]
+
+
+# 单词有序段：每行一个单词
+WORD_CODEC = RunCodec(_encode_word, _decode_word)
+
+
+def _sort_in_place(words_list):
+    """
+    原地按 (长度, 单词) 排序：先按字符串排序，再按长度稳定排序，长度相同的单词保持字母顺序
+    """
+    words_list.sort()
+    words_list.sort(key=len)
+    return words_list
+
+
+def sort_words_file(input_file, output_file, memory_limit=MEMORY_LIMIT, read_size=READ_SIZE, tmp_dir=None):
+    """
+    外部排序版本的 sort_words：文件到文件，内存占用由memory_limit限制，与输入文件大小无关
+    输出文件内容与 sort_words(整个文件内容) 的结果相同
+
+    参数：
+    input_file -- 输入文本文件路径
+    output_file -- 输出文件路径
+    memory_limit -- 整个排序过程的内存预算（字节，按 sys.getsizeof 估算），其中一半用于内存中的有序段
+    read_size -- 每次读取的字符数
+    tmp_dir -- 有序段临时文件所在目录，默认使用系统临时目录
+
+    返回：
+    int -- 排序的单词个数
+    """
+    if not input_file or not output_file:
+        raise FileNotFoundError("请传入正确的文件路径")
+    run_limit = max(1, memory_limit // RUN_SHARE)
+    read_size = max(1, min(read_size, memory_limit // READ_SHARE))
+    merge_files = max(2, min(MAX_MERGE_FILES, memory_limit // (RUN_SHARE * RUN_FILE_BYTES)))
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        runs = []
+        run_index = 0
+        words_list = []
+        used = 0
+        total = 0
+        with open(input_file, 'r', encoding='utf-8') as file:
+            for word in _iter_words(file, read_size):
+                words_list.append(word)
+                used += sys.getsizeof(word) + 8  # 8字节是列表中的指针
+                if used >= run_limit:
+                    runs.append(write_run(_sort_in_place(words_list), run_dir, run_index, WORD_CODEC))
+                    run_index += 1
+                    total += len(words_list)
+                    words_list = []
+                    used = 0
+        total += len(words_list)
+
+        # 只有一个段时不用落盘，直接在内存中排序输出
+        if runs and words_list:
+            runs.append(write_run(_sort_in_place(words_list), run_dir, run_index, WORD_CODEC))
+            run_index += 1
+            words_list = []
+
+        # 有序段太多时分多轮归并，避免同时打开过多文件
+        runs = reduce_runs(runs, run_dir, run_index, _word_key, WORD_CODEC, max_files=merge_files)
+        with open_runs(runs, WORD_CODEC) as run_words:
+            if run_words:
+                sorted_words = heapq.merge(*run_words, key=_word_key)
+            else:
+                sorted_words = iter(_sort_in_place(words_list))
+            with open(output_file, 'w', encoding='utf-8') as out:
+                # 逐个写出单词，不按批拼接，输出阶段的内存与单词长度无关
+                first = next(sorted_words, None)
+                if first is not None:
+                    out.write(first)
+                    out.writelines(" " + word for word in sorted_words)
+    return total
+
 
 if __name__ == "__main__":
     # 测试用例
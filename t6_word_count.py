@@ -44,33 +44,195 @@
 #    - try-except 结构：捕获和处理特定类型的异常
 #    - FileNotFoundError：文件不存在时的异常
 #    - with语句：确保文件正确关闭，即使发生异常
+# 
+# 6. 批量处理提速：
+#    - re.compile()：正则只编译一次，避免每行都去查正则缓存
+#    - 原来的 r'[^a-zA-Z\s+]' 中 \s+ 写在方括号里表示"空白或+号"，所以单词实际是连续的 [a-zA-Z+] 字符
+#    - file.readlines(hint)：一次读取大约hint个字符的多行，按块处理而不是逐行处理，减少Python层的循环次数
+#    - str.translate(table)：按映射表一次性替换整块文本，这里把非单词字符变成空格、大写字母变成小写
+#    - str.isascii()：纯ASCII文本可以直接用translate；含非ASCII字符时改用正则 findall 提取单词
+#    - collections.Counter.update(iterable)：在C层批量计数，比 dict.get(word,0)+1 快
+# 
+# 7. 多进程 map-reduce：
+#    - 按字节把文件切成 workers 段，每段的边界都挪到下一个换行符之后，保证单词不会被切断
+#    - UTF-8 中换行符 b'\n' 不会出现在多字节字符内部，所以在换行处切开后每段都能单独解码
+#    - 每个子进程统计自己那一段得到一个 Counter（map），再两两合并（树形 reduce）得到总数
+#    - file.seek(offset)：移动文件指针到指定字节位置，二进制模式下可以精确定位
+#    - 按换行切分区间、按块读取区间的 split_line_ranges / iter_line_blocks 在 chunked_io 中，t7_csv_average 也使用它们
+# 
+# 8. 只取前k个：
+#    - heapq.nsmallest(k, iterable, key)：用大小为k的堆选出最小的k个，时间 O(V log k)，不需要对全部V个单词排序
+#    - 排序键仍然是 (-次数, 单词)，所以并列时的顺序和完整排序完全一样
+#    - 停用词要在选择之前过滤掉，否则前k个里混进停用词后数量就不够了
+# 
+# 9. 内存映射（mmap）按字节扫描：
+#    - mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)：把文件映射到内存，操作系统按需从页缓存读入，不用先read()拷贝一份
+#    - 每次只从 mmap 中切出约 BLOCK_SIZE 字节的窗口（按换行对齐），用256项的 bytes.translate 表一次完成
+#      "非单词字节变空格、大写变小写"，再 split() 得到 bytes 单词，整个过程不做UTF-8解码
+#    - 用 bytes 正则 findall(mm, pos, endpos) 也能直接在 mmap 上匹配，但每个匹配都要创建对象，实测比 translate 慢
+#    - UTF-8 中非ASCII字符的每个字节都 >= 0x80，不属于 [a-zA-Z+]，所以按字节扫描和按字符扫描得到的单词一样
+#    - 先用 bytes 做键计数，最后只对不同的键做一次 decode()
+#    - 注意：这种方式不会校验文件是否是合法的UTF-8
 
+import heapq
+import mmap
+import os
 import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from chunked_io import iter_line_blocks, split_line_ranges
+
+# 单词由连续的英文字母或+号组成（与原来 re.sub(r'[^a-zA-Z\s+]', ' ', line) 的效果一致）
+WORD_PATTERN = re.compile(r'[a-zA-Z+]+')
+_WORD_CHARS = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ+")
+# ASCII映射表：单词字符转小写，其余字符都替换成空格
+ASCII_TABLE = str.maketrans({chr(i): chr(i).lower() if chr(i) in _WORD_CHARS else " " for i in range(128)})
+# 与 ASCII_TABLE 相同规则的 bytes 版本（256项），用于 mmap 模式
+BYTES_TABLE = bytes(c if chr(c) in _WORD_CHARS else ord(" ") for c in range(256)).lower()
+# 每次读取的字符数（按行对齐）
+BLOCK_SIZE = 1 << 20
+
+
+def tokenize_block(text):
+    """
+    从一大块文本中提取所有单词（已转小写）
+
+    参数：
+    text -- 文本块
+
+    返回：
+    list -- 单词列表
+    """
+    if text.isascii():
+        return text.translate(ASCII_TABLE).split()
+    return [word.lower() for word in WORD_PATTERN.findall(text)]
+
+
+def _count_mmap_range(file_path, start=0, end=None):
+    """
+    用mmap按字节扫描文件 [start, end) 区间（start和end需在行首或文件末尾），
+    返回以小写bytes为键的Counter
+    """
+    counter = Counter()
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        end = size if end is None else end
+        if start >= end:
+            return counter  # 空文件无法映射
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            while pos < end:
+                # 每次处理约BLOCK_SIZE字节，窗口末尾对齐到换行之后，单词不会被切断
+                stop = mm.find(b"\n", min(pos + BLOCK_SIZE, end), end) + 1 or end
+                counter.update(mm[pos:stop].translate(BYTES_TABLE).split())
+                pos = stop
+    return counter
+
+
+def _fold_bytes_counter(counter):
+    """
+    把bytes键的Counter转成str键，只对不同的键做解码
+    """
+    return Counter({word.decode('ascii'): count for word, count in counter.items()})
+
+
+def _count_range(file_path, start, end, use_mmap=False):
+    """
+    子进程任务：统计文件 [start, end) 字节区间内的单词
+    """
+    if use_mmap:
+        return _fold_bytes_counter(_count_mmap_range(file_path, start, end))
+    counter = Counter()
+    for data in iter_line_blocks(file_path, start, end):
+        counter.update(tokenize_block(data.decode('UTF-8')))
+    return counter
+
+
+def _tree_reduce(counters):
+    """
+    两两合并 Counter，直到只剩一个
+    """
+    if not counters:
+        return Counter()
+    while len(counters) > 1:
+        merged = []
+        for i in range(0, len(counters) - 1, 2):
+            counters[i].update(counters[i + 1])
+            merged.append(counters[i])
+        if len(counters) % 2:
+            merged.append(counters[-1])
+        counters = merged
+    return counters[0]
+
+
+def _count_words_parallel(file_path, workers, use_mmap=False):
+    ranges = split_line_ranges(file_path, workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_count_range, file_path, start, end, use_mmap) for start, end in ranges]
+        counters = [future.result() for future in futures]
+    return _tree_reduce(counters)
+
+
+def _frequency_key(item):
+    # 频率降序，频率相同按单词字母顺序
+    return -item[1], item[0]
+
+
+def top_words(word_counts, top_k=None, stop_words=None):
+    """
+    按 (-次数, 单词) 的顺序选出单词，可以先过滤停用词，top_k 不为None时用堆只选前k个
+
+    参数：
+    word_counts -- 单词到次数的字典（或 Counter）
+    top_k -- 只返回前k个，None表示返回全部（完整排序）
+    stop_words -- 需要排除的单词集合
+
+    返回：
+    list -- (单词, 出现次数) 元组列表
+    """
+    items = word_counts.items()
+    if stop_words:
+        items = [item for item in items if item[0] not in stop_words]
+    if top_k is None:
+        return sorted(items, key=_frequency_key)
+    return heapq.nsmallest(top_k, items, key=_frequency_key)
+
 
-def count_words(file_path):
+def count_words(file_path, workers=None, top_k=None, stop_words=None, use_mmap=False):
     """
     统计文件中单词出现的次数
     :param file_path: 文件路径
+    :param workers: 进程数，大于1时按换行对齐的字节区间分给多个进程统计，默认单进程
+    :param top_k: 只返回出现次数最多的前k个单词，默认返回全部
+    :param stop_words: 需要排除的单词集合（小写），在选出前k个之前过滤
+    :param use_mmap: 为True时用mmap按字节扫描文件，不逐行解码（不校验UTF-8）
     :return: 按频率降序排序的单词列表，每个元素为(单词, 出现次数)的元组
     """
     # 在这里实现你的代码
     if not file_path:
         raise FileNotFoundError("请传入正确的文件路径")
     
-    word_dict={}
-    with open(file_path,'r',encoding='UTF-8') as file:
-        for line in file: 
-            #这里怎么正确的从str中读取出单词，如何忽略掉标点符号？ 这里通过正则替换掉非字母的特殊字符，并保留空格
-            str_line = re.sub(r'[^a-zA-Z\s+]',' ',line)
-            word_list = str_line.split()
-            for word in word_list:
-                word = word.lower()
-                word_dict[word] = word_dict.get(word,0)+1 #向dict添加词典，并记录频率
+    if workers and workers > 1:
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"文件不存在: {file_path}")
+        word_dict = _count_words_parallel(file_path, workers, use_mmap)
+    elif use_mmap:
+        word_dict = _fold_bytes_counter(_count_mmap_range(file_path))
+    else:
+        word_dict=Counter()
+        with open(file_path,'r',encoding='UTF-8') as file:
+            # 按块读取（块内是完整的行，单词不会被切断），整块提取单词后批量计数
+            while True:
+                lines = file.readlines(BLOCK_SIZE)
+                if not lines:
+                    break
+                word_dict.update(tokenize_block("".join(lines)))
     
     # 在map键值对中，实现多条件排序：
     # 1. x[1]表示单词出现的次数（频率），-x[1]实现降序排序
     # 2. x[0]表示单词本身，用于字母顺序排序
-    return sorted(word_dict.items(), key=lambda x: (-x[1], x[0]))
+    return top_words(word_dict, top_k, stop_words)
 
 
 if __name__ == "__main__":
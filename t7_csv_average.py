@@ -25,40 +25,701 @@
 #    - ValueError：处理数值转换错误
 #    - try-except-else-finally结构：完整的异常处理流程
 #    - 自定义异常信息：提供友好的错误提示
+#
+# 4. 单遍流式统计：
+#    - csv.reader 每行返回一个列表，比 DictReader 每行新建一个字典省内存、更快；列下标在读表头时确定一次
+#    - 每次读取一块行（itertools.islice），用 zip(*rows) 转成按列的元组，再用 map(float, ...) 整列转换，
+#      把大部分循环交给C实现，避免在Python层逐个单元格处理
+#    - array('d')：紧凑的双精度浮点数组，每列一个位置，保存运行中的均值、最小值、最大值等
+#    - Welford/Chan 算法：每块先算出块内均值和"与均值差的平方和"(M2)，再合并进总的均值和M2，
+#      方差 = M2 / n，只需遍历一次数据，也不会像 sum(x²)/n - mean² 那样出现严重的精度损失
+#    - 精确求和：浮点数逐个相加的结果和相加顺序有关，分块、分进程合并时末位可能不同，四舍五入后偶尔差0.01。
+#      任何有限浮点数都是 2^-1074 的整数倍，这里每列把精确总和保存成一个 Python 大整数（以 2^-1074 为单位），
+#      合并两部分结果时整数直接相加，平均值用整数除法 总和 / (个数 * 2^1074) 得到正确舍入的结果，与相加顺序、分块方式都无关。
+#      每块先用 math.fsum() 求出正确舍入的和 head，再 fsum 一次求出剩下的部分 rest，通常 head + rest 就是精确和，
+#      只有验证不通过时才逐个用 float.as_integer_ratio() 换算；inf/-inf/nan 单独相加，有它们时平均值就是 inf 或 nan
+#
+# 5. NumPy 向量化后端（可选，需要安装 NumPy）：
+#    - 每次读取约固定字节数的整行（file.readlines(hint)），用 np.loadtxt 在C层直接把整块文本解析成二维 float 数组，
+#      内存只和块大小有关
+#    - 非数值单元格用一个同形状的布尔数组（掩码）标记，按列用 np.count_nonzero 等一次算完整块的个数、最小值、最大值
+#    - 总和同样精确求和：np.frexp/np.ldexp 把每个数放大成小于 2^53 的整数，拆成高低两半后按 (列, 指数) 用 np.bincount 相加，
+#      每一步都没有舍入，最后每个 (列, 指数) 只做一次大整数移位相加
+#    - 非数值数据的处理策略（policy）：
+#      * 'raise'：和原来一样，遇到非数值直接抛出 ValueError
+#      * 'skip'：跳过包含非数值的整行
+#      * 'missing'：只把该单元格当作缺失值，不计入这一列，同一行其他列照常统计
+#      后两种策略都会按列统计非数值单元格的个数
+#    - 内容为 nan 的单元格是合法的数值（float('nan')），和纯Python后端一样计入统计，该列平均值为 nan；
+#      所以缺失值不能借用 NaN 表示，要单独用掩码记录
+#
+# 6. 多进程分片：
+#    - 主进程只读一次表头，把后面的数据按字节切成 workers 段，每段边界挪到下一个换行符之后
+#      （切分和按块读取使用 chunked_io 中的 split_line_ranges / iter_line_blocks，与 t6_word_count 相同）
+#    - 每个子进程统计自己那一段，返回 ColumnAccumulator（总和、个数等都可以直接相加合并）
+#    - 按文件顺序合并各段结果；总和是精确求和，平均值与单进程完全相同（方差等统计量按块合并，末位可能不同）
+#    - 限制：按换行切分，要求引号内的字段不能包含换行符
+#
+# 7. 增量统计（适合只追加的日志型CSV）：
+#    - 把每列的总和、个数等统计量和已处理到的字节位置（offset）保存到旁边的状态文件（JSON）里
+#    - 下次运行先校验：表头的哈希一致、文件没有变小、offset 之前最后一段字节的哈希一致，才认为只是在末尾追加了数据，
+#      只读取 offset 之后新增的字节；否则认为文件被截断或重写，从头重新统计
+#    - 状态只记录到最后一个换行符为止：末尾没有换行的最后一行会统计进本次结果（累加在状态的一份副本上），
+#      但不写入状态文件，下次运行时重新读取它，它之后再追加的内容也能正确接上
+#    - 新数据的精确总和直接加到已保存的总和上，平均值和从头统计完全一致；JSON 保存浮点数用 repr，读回来的值不变
+#    - 状态文件先写临时文件再用 os.replace() 替换，中途出错不会留下写了一半的状态
 
 import csv
+import hashlib
+import io
+import json
+import math
+import os
+import warnings
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 
+from chunked_io import iter_line_blocks, split_line_ranges
 
-def calculate_average(input_file, output_file):
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖，只有 backend='numpy' 时才需要
+    np = None
 
-    
+# 每次处理的行数
+CHUNK_ROWS = 4096
+# numpy 后端每块读取的字节数（按整行读取）
+NUMPY_CHUNK_BYTES = 4 * 1024 * 1024
+
+# 增量模式状态文件的格式版本，以及校验时比较的 offset 之前的字节数
+STATE_VERSION = 3
+STATE_TAIL_BYTES = 4096
+
+# 精确总和以 2^-EXACT_UNIT_BITS（最小的正浮点数）为单位保存成整数；
+# numpy 精确求和时每次最多 bincount 的元素个数，保证按指数分组的和都小于 2^53
+EXACT_UNIT_BITS = 1074
+EXACT_BINCOUNT_ROWS = 1 << 25
+_SPLIT_MAGIC = 1.5 * 2.0 ** 78
+
+BACKENDS = ("python", "numpy")
+BAD_CELL_POLICIES = ("raise", "skip", "missing")
+
+# 统计输出中每一行的名称
+STATISTICS_FIELDS = {
+    "mean": "平均值",
+    "count": "计数",
+    "min": "最小值",
+    "max": "最大值",
+    "variance": "方差",
+    "bad": "非数值个数",
+}
+
+
+def _float_units(x):
+    """
+    有限浮点数x精确地等于 _float_units(x) 个 2^-1074（最小的正浮点数）
+    """
+    numerator, denominator = x.as_integer_ratio()  # denominator 是2的幂，最大为 2^1074
+    return numerator << (EXACT_UNIT_BITS + 1 - denominator.bit_length())
+
+
+def _exact_sum(values, minimum, maximum):
+    """
+    一批浮点数的精确总和
+
+    参数：
+    values -- float列表
+    minimum / maximum -- values 中的最小值和最大值
+
+    返回：
+    tuple -- (有限值的精确和，以 2^-1074 为单位的整数, 非有限值（inf/-inf/nan）之和，没有时为0.0)
+    """
     try:
-        num_dict = {}
-        count_dict = {}
-        avg_dict = {}
-        
-        # 读取CSV文件并计算每列的总和和计数，csv默认分隔符为逗号，自定义分隔符需指定，示例：csv.reader(file, delimiter=';')
-        with open(input_file, newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)  # dictreader 以字典形式读取CSV，将列名作为键，读取示例：{'name': 'Alice', 'age': '25'}
-            for line in reader:
-                for key, value in line.items():  # 修正：使用items()方法
-                    try:
-                        num_value = float(value)  # 尝试转换为浮点数
-                        num_dict[key] = num_dict.setdefault(key, 0) + num_value  # 修正：正确使用setdefault
-                        count_dict[key] = count_dict.setdefault(key, 0) + 1
-                    except ValueError:
-                        raise ValueError(f"列 '{key}' 中包含非数值数据: '{value}'")
+        head = math.fsum(values)  # 正确舍入的总和
+    except (OverflowError, ValueError):  # 中间结果超出浮点范围，或者同时有 inf 和 -inf
+        head = math.nan
+    if not math.isfinite(head):
+        finite = [x for x in values if math.isfinite(x)]
+        return sum(map(_float_units, finite)), sum((x for x in values if not math.isfinite(x)), 0.0)
+    # 同号时所有数都是 ulp(绝对值最小的数) 的整数倍，总和也是，绝对值小于 limit 的这种数都能用浮点数精确表示
+    limit = 0.0
+    if minimum > 0 or maximum < 0:
+        limit = math.ulp(min(abs(minimum), abs(maximum))) * 2 ** 53
+    if abs(head) < limit:
+        return _float_units(head), 0.0
+    rest = math.fsum(chain(values, (-head,)))  # 总和减去 head 剩下的部分
+    # 精确和不为0时 fsum 的结果也不为0，所以剩下的部分为0就说明 head + rest 是精确的
+    if not rest or abs(rest) < limit or not math.fsum(chain(values, (-head, -rest))):
+        return _float_units(head) + _float_units(rest), 0.0
+    return sum(map(_float_units, values)), 0.0
 
-        # 计算每列的平均值
-        for key, value in num_dict.items():  # 修正：使用items()方法
-            count = count_dict[key]
-            avg_dict[key] = round(value/count, 2)
+
+def _exact_sums_numpy(block, valid):
+    """
+    numpy 版本的 _exact_sum：对二维数组 block 中 valid 为True的单元格按列精确求和，整块向量化计算
+
+    返回：
+    list -- 每列一个 (有限值的精确和, 非有限值之和)，含义同 _exact_sum
+    """
+    finite = valid & np.isfinite(block)
+    specials = [0.0] * block.shape[1]
+    special_cells = valid & ~finite
+    if special_cells.any():
+        with np.errstate(invalid='ignore'):  # inf + -inf 得到 nan，和逐个相加一样，不用警告
+            for i in np.flatnonzero(special_cells.any(axis=0)):
+                specials[i] = float(block[special_cells[:, i], i].sum())
+    values = np.where(finite, block, 0.0)  # 缺失值和非有限值按0处理，不影响总和
+    # x = m * 2^e（0.5 <= |m| < 1），x * 2^(53-e) 是绝对值小于 2^53 的整数；非规格化数统一按 e=-1021 放大
+    exponents = np.maximum(np.frexp(values)[1], -1021)
+    scaled = np.ldexp(values, 53 - exponents)
+    # 拆成高低两部分：加上再减去 1.5 * 2^78 会把整数舍入到 2^26 的倍数（这两步都是精确的），剩下的是低位；
+    # 同一列、同一指数的高位和低位分别用 bincount 相加，每一步都是小于 2^53 的整数，没有舍入
+    high = scaled + _SPLIT_MAGIC
+    high -= _SPLIT_MAGIC
+    low = scaled  # 原地计算，少分配几个临时数组
+    low -= high
+    high *= 2.0 ** -26
+    lowest = int(exponents.min())
+    span = int(exponents.max()) - lowest + 1
+    width = block.shape[1]
+    index = exponents
+    index += np.arange(width, dtype=index.dtype) * span - lowest
+    totals = [0] * width
+    for start in range(0, block.shape[0], EXACT_BINCOUNT_ROWS):
+        rows = slice(start, start + EXACT_BINCOUNT_ROWS)
+        high_sums = np.bincount(index[rows].ravel(), weights=high[rows].ravel(), minlength=width * span)
+        low_sums = np.bincount(index[rows].ravel(), weights=low[rows].ravel(), minlength=width * span)
+        for k in np.flatnonzero((high_sums != 0) | (low_sums != 0)).tolist():
+            column, exponent = divmod(k, span)
+            totals[column] += ((int(high_sums[k]) << 26) + int(low_sums[k])) << (lowest + exponent + 1021)
+    return list(zip(totals, specials))
+
+
+def _exact_mean(total, special, count):
+    """
+    由 _exact_sum 的结果计算平均值：整数除法的结果是正确舍入的，与相加顺序、分块方式都无关
+    """
+    if special:
+        return special / count
+    return total / (count << EXACT_UNIT_BITS)
+
+
+class ColumnAccumulator:
+    """
+    每列的运行统计，所有字段都是按列下标存放的数组
+    count -- 有效数值个数
+    total -- 每列有限值的精确总和，以 2^-1074 为单位的整数（见 _exact_sum），合并时直接相加，与顺序无关
+    special -- 每列 inf/-inf/nan 之和，不为0时平均值就是它（与逐个相加的结果一致）
+    mean / m2 -- Welford 算法的均值和与均值差的平方和
+    minimum / maximum -- 最小值和最大值
+    bad -- 非数值单元格个数（只有 numpy 后端的 skip/missing 策略会记录）
+    """
+
+    # 各统计数组的名字和类型码，保存/恢复状态时使用
+    ARRAY_TYPES = {"count": 'q', "special": 'd', "mean": 'd', "m2": 'd', "minimum": 'd', "maximum": 'd', "bad": 'q'}
+
+    def __init__(self, columns):
+        width = len(columns)
+        self.columns = list(columns)
+        self.count = array('q', [0]) * width
+        self.total = [0] * width
+        self.special = array('d', [0.0]) * width
+        self.mean = array('d', [0.0]) * width
+        self.m2 = array('d', [0.0]) * width
+        self.minimum = array('d', [float('inf')]) * width
+        self.maximum = array('d', [float('-inf')]) * width
+        self.bad = array('q', [0]) * width
+
+    def _merge_column(self, i, n, total, special, mean, m2, minimum, maximum):
+        """
+        把一组统计量（n个数的精确总和、非有限值之和、均值、M2、最小值、最大值）合并到第i列
+        """
+        if not n:
+            return
+        count = self.count[i]
+        new_count = count + n
+        delta = mean - self.mean[i]
+        self.mean[i] += delta * n / new_count
+        self.m2[i] += m2 + delta * delta * count * n / new_count
+        self.count[i] = new_count
+        self.total[i] += total
+        self.special[i] += special
+        if minimum < self.minimum[i]:
+            self.minimum[i] = minimum
+        if maximum > self.maximum[i]:
+            self.maximum[i] = maximum
+
+    def add_values(self, i, values):
+        """
+        把第i列的一批数值累加进来
+
+        参数：
+        i -- 列下标
+        values -- float列表
+        """
+        n = len(values)
+        if not n:
+            return
+        minimum, maximum = min(values), max(values)
+        total, special = _exact_sum(values, minimum, maximum)
+        mean = _exact_mean(total, special, n)
+        m2 = sum([(x - mean) * (x - mean) for x in values])
+        self._merge_column(i, n, total, special, mean, m2, minimum, maximum)
+
+    def add_rows(self, reader):
+        """
+        把reader中的所有数据行按块累加进来，遇到非数值数据抛出ValueError
+
+        参数：
+        reader -- csv.reader 对象（表头已经读过）
+        """
+        columns = self.columns
+        width = len(columns)
+        while True:
+            rows = list(islice(reader, CHUNK_ROWS))
+            if not rows:
+                break
+            if any(len(row) != width for row in rows):
+                rows = [row for row in rows if row]  # 空行直接跳过，与 DictReader 一致
+                for row in rows:
+                    if len(row) != width:
+                        raise ValueError(f"数据行 {row} 有{len(row)}列，与表头的{width}列不一致")
+            for i, column in enumerate(zip(*rows)):
+                try:
+                    values = list(map(float, column))
+                except ValueError:
+                    for value in column:
+                        try:
+                            float(value)
+                        except ValueError:
+                            raise ValueError(f"列 '{columns[i]}' 中包含非数值数据: '{value}'")
+                    raise
+                self.add_values(i, values)
+
+    def merge(self, other):
+        """
+        合并另一个列相同的 ColumnAccumulator（例如另一部分数据的统计结果）
+        """
+        if other.columns != self.columns:
+            raise ValueError(f"列名不一致，无法合并: {other.columns} != {self.columns}")
+        for i in range(len(self.columns)):
+            self._merge_column(i, other.count[i], other.total[i], other.special[i], other.mean[i], other.m2[i],
+                               other.minimum[i], other.maximum[i])
+            self.bad[i] += other.bad[i]
+
+    def to_state(self):
+        """
+        返回可以直接写入JSON的字典，包含列名和所有统计数组
+        """
+        state = {"columns": self.columns, "total": self.total}
+        for name in self.ARRAY_TYPES:
+            state[name] = getattr(self, name).tolist()
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        由 to_state() 的结果恢复 ColumnAccumulator
+        """
+        accumulator = cls(state["columns"])
+        for name, typecode in cls.ARRAY_TYPES.items():
+            values = array(typecode, state[name])
+            if len(values) != len(accumulator.columns):
+                raise ValueError(f"状态中 {name} 的长度与列数不一致")
+            setattr(accumulator, name, values)
+        total = [int(value) for value in state["total"]]
+        if len(total) != len(accumulator.columns):
+            raise ValueError("状态中 total 的长度与列数不一致")
+        accumulator.total = total
+        return accumulator
+
+    def averages(self):
+        """
+        返回 {列名: 保留两位小数的平均值}，没有数据的列不输出
+        """
+        return {column: round(_exact_mean(self.total[i], self.special[i], self.count[i]), 2)
+                for i, column in enumerate(self.columns) if self.count[i]}
+
+    def statistics(self):
+        """
+        返回 {列名: {"count", "min", "max", "mean", "variance", "bad"}}，方差为总体方差 M2/n
+        """
+        result = {}
+        for i, column in enumerate(self.columns):
+            n = self.count[i]
+            if not n:
+                continue
+            result[column] = {
+                "count": n,
+                "min": self.minimum[i],
+                "max": self.maximum[i],
+                "mean": self.mean[i],
+                "variance": self.m2[i] / n,
+                "bad": self.bad[i],
+            }
+        return result
+
+
+def _parse_chunk_slow(lines, columns, policy, bad):
+    """
+    numpy 后端中 np.loadtxt 解析失败的块：逐个单元格转换，按策略处理非数值数据
+
+    返回：
+    tuple -- (二维float数组, 同形状的布尔数组，False 表示非数值单元格)
+    """
+    width = len(columns)
+    data = []
+    valid = []
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        if len(row) != width:
+            raise ValueError(f"数据行 {row} 有{len(row)}列，与表头的{width}列不一致")
+        values = []
+        flags = []
+        for i, value in enumerate(row):
+            try:
+                values.append(float(value))
+                flags.append(True)
+            except ValueError:
+                if policy == "raise":
+                    raise ValueError(f"列 '{columns[i]}' 中包含非数值数据: '{value}'")
+                bad[i] += 1
+                values.append(0.0)
+                flags.append(False)
+        if policy == "skip" and not all(flags):
+            continue
+        data.append(values)
+        valid.append(flags)
+    return np.array(data, dtype=np.float64).reshape(-1, width), np.array(valid, dtype=bool).reshape(-1, width)
+
+
+def _add_chunk_numpy(accumulator, block, valid):
+    """
+    把二维数组 block（行 x 列）中 valid 为True的单元格按列归约后合并进 accumulator
+    （内容为 nan 的单元格是有效数值，和纯Python后端一样计入统计）
+    """
+    counts = np.count_nonzero(valid, axis=0)
+    sums = _exact_sums_numpy(block, valid)
+    means = np.array([_exact_mean(total, special, n) if n else 0.0
+                      for (total, special), n in zip(sums, counts.tolist())])
+    with np.errstate(invalid='ignore', over='ignore'):  # 有 inf 时 inf - inf 得到 nan，结果和纯Python一致，不用警告
+        deviations = np.where(valid, block - means, 0.0)
+        m2 = (deviations * deviations).sum(axis=0)
+    minimums = np.where(valid, block, np.inf).min(axis=0)
+    maximums = np.where(valid, block, -np.inf).max(axis=0)
+    for i, (total, special) in enumerate(sums):
+        accumulator._merge_column(i, int(counts[i]), total, special, float(means[i]), float(m2[i]),
+                                  float(minimums[i]), float(maximums[i]))
+
+
+def _add_line_blocks_numpy(accumulator, blocks, policy):
+    """
+    numpy 后端：逐块解析文本行并归约进 accumulator
+
+    参数：
+    accumulator -- ColumnAccumulator
+    blocks -- 可迭代对象，每个元素是一块文本行的列表
+    policy -- 非数值数据的处理策略
+    """
+    header = accumulator.columns
+    width = len(header)
+    for lines in blocks:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # 整块都是空行时 loadtxt 会发出警告
+                block = np.loadtxt(lines, delimiter=',', quotechar='"', comments=None, dtype=np.float64, ndmin=2)  # 不把 '#' 当注释，否则整行或行尾会被悄悄丢掉
+            if block.shape[0] and block.shape[1] != width:
+                raise ValueError("列数与表头不一致")
+            valid = np.ones(block.shape, dtype=bool)
+        except ValueError:
+            block, valid = _parse_chunk_slow(lines, header, policy, accumulator.bad)
+        if block.shape[0]:
+            _add_chunk_numpy(accumulator, block, valid)
+
+
+def _read_columns_numpy(input_file, policy="raise", chunk_bytes=None):
+    """
+    numpy 后端：按块解析并归约，返回 ColumnAccumulator
+    """
+    chunk_bytes = chunk_bytes or NUMPY_CHUNK_BYTES
+    with open(input_file, newline='', encoding='utf-8') as file:
+        header = next(csv.reader([file.readline()]), None)
+        accumulator = ColumnAccumulator(header or [])
+        if header:
+            _add_line_blocks_numpy(accumulator, iter(lambda: file.readlines(chunk_bytes), []), policy)
+    return accumulator
+
+
+def _read_columns(input_file, backend="python", policy="raise"):
+    """
+    单遍读取CSV文件并返回 ColumnAccumulator
+    """
+    if backend == "numpy":
+        return _read_columns_numpy(input_file, policy)
+    with open(input_file, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        accumulator = ColumnAccumulator(header or [])
+        if header:
+            accumulator.add_rows(reader)
+    return accumulator
+
+
+def _split_lines(data):
+    """
+    把字节解码后按行切开（保留换行符），切分规则和 open(..., newline='') 逐行读取时一致
+    """
+    return io.StringIO(data.decode('utf-8'), newline='').readlines()
+
+
+def _iter_range_blocks(input_file, start, end, block_size):
+    """
+    按块读取文件 [start, end) 字节区间，每次产出一块完整文本行组成的列表
+    """
+    return map(_split_lines, iter_line_blocks(input_file, start, end, block_size))
+
+
+def _add_range(accumulator, input_file, start, end, backend, policy):
+    """
+    把 [start, end) 字节区间内的数据行累加进 accumulator
+    """
+    blocks = _iter_range_blocks(input_file, start, end, NUMPY_CHUNK_BYTES)
+    if backend == "numpy":
+        _add_line_blocks_numpy(accumulator, blocks, policy)
+    else:
+        accumulator.add_rows(csv.reader(chain.from_iterable(blocks)))
+
+
+def _aggregate_shard(input_file, header, start, end, backend, policy):
+    """
+    子进程任务：统计 [start, end) 字节区间内的数据行，返回这一段的 ColumnAccumulator
+    """
+    accumulator = ColumnAccumulator(header)
+    _add_range(accumulator, input_file, start, end, backend, policy)
+    return accumulator
+
+
+def _add_range_parallel(accumulator, input_file, start, end, workers, backend, policy):
+    """
+    把 [start, end) 按字节分段交给多个子进程统计，再按文件顺序合并进 accumulator
+    """
+    ranges = split_line_ranges(input_file, workers, start, end)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_aggregate_shard, input_file, accumulator.columns, low, high, backend, policy)
+                   for low, high in ranges]
+        # 按文件顺序依次合并，总和的累加顺序是固定的
+        for future in futures:
+            accumulator.merge(future.result())
+
+
+def _read_header(file):
+    """
+    从二进制文件开头读取表头，返回 (表头行的原始字节, 列名列表或None)
+    """
+    first_line = file.readline()
+    return first_line, next(csv.reader([first_line.decode('utf-8')]), None)
+
+
+def _read_columns_parallel(input_file, workers, backend="python", policy="raise"):
+    """
+    多进程版本：主进程只读表头，数据按字节分段交给子进程统计，最后按文件顺序合并各段结果
+    """
+    with open(input_file, 'rb') as file:
+        _, header = _read_header(file)
+        data_start = file.tell()
+        size = os.fstat(file.fileno()).st_size
+    accumulator = ColumnAccumulator(header or [])
+    if header:
+        _add_range_parallel(accumulator, input_file, data_start, size, workers, backend, policy)
+    return accumulator
+
+
+def _last_line_end(file, start, end):
+    """
+    在 [start, end) 中从后往前找最后一个换行符，返回它后面的位置；没有完整的行时返回start
+    """
+    position = end
+    while position > start:
+        step = min(NUMPY_CHUNK_BYTES, position - start)
+        file.seek(position - step)
+        index = file.read(step).rfind(b"\n")
+        if index >= 0:
+            return position - step + index + 1
+        position -= step
+    return start
+
+
+def _tail_hash(file, data_start, offset):
+    """
+    offset 之前最后 STATE_TAIL_BYTES 个字节（不含表头）的哈希，用于判断已处理的部分有没有被改写
+    """
+    low = max(data_start, offset - STATE_TAIL_BYTES)
+    file.seek(low)
+    return hashlib.sha256(file.read(offset - low)).hexdigest()
+
+
+def _load_state(state_file):
+    """
+    读取状态文件，不存在或内容损坏时返回None（随后会从头统计）
+    """
+    try:
+        with open(state_file, 'r', encoding='utf-8') as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def _save_state(state_file, state):
+    """
+    先写临时文件再替换，保证状态文件要么是旧的要么是完整的新内容
+    """
+    temp_file = state_file + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8') as file:
+        json.dump(state, file, ensure_ascii=False)
+    os.replace(temp_file, state_file)
+
+
+def _resume_state(state, file, header_hash, data_start, size, backend, policy):
+    """
+    判断保存的状态能否接着用：同一个后端和策略、表头相同、文件没有变小、已处理部分的末尾没有被改写
+
+    返回：
+    tuple -- (ColumnAccumulator, offset)，需要从头统计时返回None
+    """
+    if state is None or state.get("backend") != backend or state.get("policy") != policy:
+        return None
+    try:
+        offset = state["offset"]
+        if state["header_hash"] != header_hash or size < state["size"] or not data_start <= offset <= size:
+            return None
+        if state["tail_hash"] != _tail_hash(file, data_start, offset):
+            return None
+        return ColumnAccumulator.from_state(state["accumulator"]), offset
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _read_columns_incremental(input_file, state_file, backend="python", policy="raise", workers=None):
+    """
+    增量版本：状态有效时只读取上次 offset 之后新增的完整行，否则从头统计，然后更新状态文件；
+    末尾没有换行的最后一行只计入返回的结果，不计入保存的状态
+
+    返回：
+    ColumnAccumulator
+    """
+    with open(input_file, 'rb') as file:
+        first_line, header = _read_header(file)
+        data_start = file.tell()
+        size = os.fstat(file.fileno()).st_size
+        header_hash = hashlib.sha256(first_line).hexdigest()
+        resumed = _resume_state(_load_state(state_file), file, header_hash, data_start, size, backend, policy)
+        if resumed is None:
+            accumulator, start = ColumnAccumulator(header or []), data_start
+        else:
+            accumulator, start = resumed
+        end = _last_line_end(file, start, size)
+        if header and end > start:
+            if workers and workers > 1:
+                _add_range_parallel(accumulator, input_file, start, end, workers, backend, policy)
+            else:
+                _add_range(accumulator, input_file, start, end, backend, policy)
+        state = {
+            "version": STATE_VERSION,
+            "backend": backend,
+            "policy": policy,
+            "header_hash": header_hash,
+            "offset": end,
+            "size": size,
+            "tail_hash": _tail_hash(file, data_start, end),
+            "accumulator": accumulator.to_state(),
+        }
+    _save_state(state_file, state)
+    if header and end < size:
+        # 在副本上统计没有换行结尾的最后一行，已保存的状态不包含它
+        accumulator = ColumnAccumulator.from_state(state["accumulator"])
+        _add_range(accumulator, input_file, end, size, backend, policy)
+    return accumulator
+
+
+def _check_backend(backend, policy):
+    if backend not in BACKENDS:
+        raise ValueError(f"backend 只能是 {BACKENDS} 之一: {backend}")
+    if policy not in BAD_CELL_POLICIES:
+        raise ValueError(f"policy 只能是 {BAD_CELL_POLICIES} 之一: {policy}")
+    if backend == "python" and policy != "raise":
+        raise ValueError("policy 为 'skip' 或 'missing' 时需要使用 backend='numpy'")
+    if backend == "numpy" and np is None:
+        raise ImportError("backend='numpy' 需要先安装 NumPy：pip install numpy")
+
+
+def column_statistics(input_file, backend="python", policy="raise"):
+    """
+    单遍计算每列的计数、最小值、最大值、均值、方差和非数值单元格个数
+
+    参数：
+    input_file -- 输入CSV文件路径
+    backend -- 'python'（默认）或 'numpy'
+    policy -- 非数值数据的处理策略：'raise'、'skip'、'missing'（后两种需要 numpy 后端）
+
+    返回：
+    dict -- {列名: {"count", "min", "max", "mean", "variance", "bad"}}
+    """
+    _check_backend(backend, policy)
+    return _read_columns(input_file, backend, policy).statistics()
+
+
+def _write_output(output_file, accumulator, with_statistics):
+    averages = accumulator.averages()
+    with open(output_file, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file) #writer写入，示例： writerow写入一行，示例：['name', 'age']
+        if not with_statistics:
+            writer.writerow(averages.keys())  # 先写入列名
+            writer.writerow(averages.values())  # 再写入平均值
+            return
+        statistics = accumulator.statistics()
+        writer.writerow(["统计项"] + list(averages.keys()))
+        writer.writerow([STATISTICS_FIELDS["mean"]] + list(averages.values()))
+        for field in ("count", "min", "max", "variance", "bad"):
+            values = [stats[field] if field in ("count", "bad") else round(stats[field], 2) for stats in statistics.values()]
+            writer.writerow([STATISTICS_FIELDS[field]] + values)
+
+
+def calculate_average(input_file, output_file, with_statistics=False, backend="python", policy="raise", workers=None,
+                      state_file=None):
+    """
+    计算CSV文件每列的平均值并写入新的CSV文件
+
+    参数：
+    input_file -- 输入CSV文件路径
+    output_file -- 输出CSV文件路径
+    with_statistics -- 为False时输出原来的两行格式（列名、平均值）；
+                       为True时第一列是统计项名称，依次输出平均值、计数、最小值、最大值、方差、非数值个数
+    backend -- 'python'（默认）或 'numpy'（分块向量化，需要安装 NumPy）
+    policy -- 非数值数据的处理策略：'raise'（默认）、'skip' 跳过整行、'missing' 只忽略该单元格，后两种需要 numpy 后端
+    workers -- 进程数，大于1时把数据按换行对齐的字节区间分给多个进程统计后合并，默认单进程
+    state_file -- 增量模式的状态文件路径：给出时只读取上次之后追加的完整行，并更新状态文件；
+                  输入文件被截断或重写时自动从头统计
+
+    返回：
+    bool -- 处理成功返回True，否则抛出异常
+    """
+    _check_backend(backend, policy)
+    try:
+        # csv.reader 单遍读取，csv默认分隔符为逗号，自定义分隔符需指定，示例：csv.reader(file, delimiter=';')
+        if state_file:
+            accumulator = _read_columns_incremental(input_file, state_file, backend, policy, workers)
+        elif workers and workers > 1:
+            accumulator = _read_columns_parallel(input_file, workers, backend, policy)
+        else:
+            accumulator = _read_columns(input_file, backend, policy)
 
         # 将结果写入输出文件
-        with open(output_file, 'w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file) #writer写入，示例： writerow写入一行，示例：['name', 'age']
-            writer.writerow(num_dict.keys())  # 修正：使用keys()方法    先写入列名
-            writer.writerow(avg_dict.values())  # 修正：使用values()方法    再写入平均值
+        _write_output(output_file, accumulator, with_statistics)
         
         return True  # 操作成功完成
         
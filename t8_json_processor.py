@@ -34,90 +34,776 @@
 5. JSON输出：使用json.dump()将数据写入文件，indent=2参数使输出格式化并缩进，ensure_ascii=False允许输出非ASCII字符(如中文)。
 6. 集合遍历：字典需要使用items()方法获取键值对，而列表可以直接用for item in list_name遍历。
 7. 堆栈信息打印：使用traceback.print_exc()可以打印完整的异常堆栈信息，帮助调试。
+8. 流式解析（streaming=True）：json.load()要把整个数组读进内存，这里改为分块读取文本，
+   用 json.JSONDecoder().raw_decode(text, pos) 从指定位置解析出一个完整的元素并返回结束位置，逐个产出学生记录；
+   块末尾不完整的元素留到读入下一块后再解析，内存中只保留当前这一块文本
+9. 边读边聚合：每条记录读到时就累加学科总分/人数、最高分和爱好人数，算出这个学生的平均分，记录本身不再保留
+10. 外部排序：带平均分的学生记录直接转成输出时的缩进格式（换行换成制表符压成一行），攒到内存上限就按平均分排好序写到临时文件（有序段），
+    最后用 heapq.merge() 归并所有有序段，边归并边写输出文件；heapq.merge 和 sorted 一样是稳定的，
+    平均分相同的学生保持原来的先后顺序，输出文件与非流式模式完全相同
+    有序段的写入、分轮归并使用 chunked_io 的 write_run / open_runs / reduce_runs（与 t5_string_sort 相同），这里只提供排序键和编解码方式（RunCodec）
+11. __slots__：类里声明 __slots__ 后对象不再有 __dict__，属性存放在固定的位置，创建大量小对象时省内存、访问也更快；
+    每个学科一个 SubjectStats 保存总分、人数、最高分和获得者，一次遍历就得到全部统计；
+    学生的平均成绩按 id 汇总（原来按 name，同名的不同学生会被合在一起），同一个 id 的多条记录都使用合并后的平均成绩，
+    非流式、流式和 build_ranking 的结果一致；流式模式遇到重复的 id 时重新读一遍输入文件，用合并后的平均分重建有序段
+12. 可替换的序列化后端（serializer）：每个后端提供 loads(bytes) 和 dumps(obj, indent) -> bytes 两个方法，
+    默认标准库 json；orjson（Rust）、msgspec（C）安装后可以选用，编码/解码都快很多。
+    三者缩进2个空格的输出格式相同，文件统一按二进制写入UTF-8字节，省掉一次字符串和字节之间的转换
+13. NDJSON（每行一个JSON对象）：学生列表可以单独写成 .ndjson 文件，一条一条地编码写出，
+    不需要先拼出整个结果的大字符串，读取时也可以逐行解析
+14. 排名查询（StudentRanking）：看板通常只要前N名、某个学生的名次或百分位分数线，不必每次都把所有学生排序再重写整个JSON
+    - 前N名：heapq.nsmallest(n, ...) 维护大小为n的堆，O(人数 * log n)
+    - 名次：按平均成绩做直方图（Counter），不同成绩从高到低累加人数，建一次索引后用 bisect 二分查找，每次 O(log k)
+    - 百分位：在同一个累加人数的索引上二分查找第 ceil(p% * 人数) 个学生对应的成绩
+15. 多文件并行统计（aggregate_student_files）：平均分不能直接合并，但总分和人数可以相加，
+    所以每个子进程对一个文件只输出"部分结果"（每科总分/人数、最高分候选、爱好计数，即一个 StudentAggregator），
+    主进程按文件顺序依次 merge，最后统一计算平均分，结果和把所有文件合成一个文件统计完全一样
+    - glob.glob()：按通配符查找文件，结果排序后顺序固定
+    - executor.map()：按提交顺序返回结果，即使后面的文件先处理完
 '''
 
+import glob
+import heapq
 import json
+import math
+import os
+import re
+import sys
+import tempfile
 import traceback
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 
-def put_in_dict(obj, key, value):
-    if not isinstance(obj, dict):
-        raise TypeError("请传入字典类型数据")
-    
-    if not key:
-        raise KeyError("请传入正确的key")
-    
-    if key not in obj:
-        obj[key] = 0
+from chunked_io import RunCodec, open_runs, reduce_runs, write_run
+
+try:
+    import orjson
+except ImportError:  # orjson、msgspec 都是可选依赖，只有选用对应的 serializer 时才需要
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# 流式解析时每次读取的字符数
+READ_SIZE = 1024 * 1024
+# 流式模式下内存中学生记录的上限（字节，按 sys.getsizeof 估算），超过后排好序写到临时文件
+MEMORY_LIMIT = 64 * 1024 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+def iter_json_array(file, read_size=READ_SIZE):
+    """
+    增量解析顶层为数组的JSON文件，逐个产出数组元素
+
+    参数：
+    file -- 以文本模式打开的文件对象
+    read_size -- 每次读取的字符数
+
+    返回：
+    generator -- 依次产出数组中的每个元素，格式错误时抛出 json.JSONDecodeError
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    state = "start"  # start：等待'['，first/value：等待元素，comma：等待','或']'，done：数组已结束
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position == len(buffer):
+            if eof:
+                if state == "done":
+                    return
+                raise json.JSONDecodeError("JSON数组不完整", buffer, position)
+            chunk = file.read(read_size)
+            buffer, position, eof = chunk, 0, not chunk
+            continue
+        char = buffer[position]
+        if state == "start":
+            if char != "[":
+                raise json.JSONDecodeError("顶层必须是JSON数组", buffer, position)
+            position += 1
+            state = "first"
+        elif state == "comma" or (state == "first" and char == "]"):
+            if char == "]":
+                state = "done"
+            elif char == ",":
+                state = "value"
+            else:
+                raise json.JSONDecodeError("数组元素之间缺少逗号", buffer, position)
+            position += 1
+        elif state == "done":
+            raise json.JSONDecodeError("数组结束后还有多余内容", buffer, position)
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # 解析失败，或者元素后面还没读到','或']'（数字可能被块边界截断，如 "2.5e3" 只读到 "2."）时，
+            # 多读一些再试，每次至少翻倍避免重复解析太多次
+            if end is not None and not eof:
+                following = _WHITESPACE.match(buffer, end).end()
+                if following == len(buffer) or buffer[following] not in ",]":
+                    end = None
+            if end is None:
+                chunk = file.read(max(read_size, len(buffer) - position))
+                buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+                continue
+            position = end
+            state = "comma"
+            yield item
+
+
+class SubjectStats:
+    """
+    一个学科的统计量：总分、有效成绩个数、最高分和获得者
+    __slots__ 让对象不再带 __dict__，每个对象更省内存，属性读写也更快
+    """
+    __slots__ = ("total", "count", "top_score", "top_student")
+
+    def __init__(self):
+        self.total = 0
+        self.count = 0
+        self.top_score = 0
+        self.top_student = None
+
+
+class StudentScore:
+    """
+    一个学生（按 id 汇总）的总分和有效成绩门数
+    """
+    __slots__ = ("total", "count")
+
+    def __init__(self, total=0, count=0):
+        self.total = total
+        self.count = count
+
+    def average(self):
+        """
+        平均成绩（保留两位小数），没有有效成绩时返回None
+        """
+        return round(self.total / self.count, 2) if self.count else None
+
+
+def _add_score(scores_by_id, student_id, total, count):
+    """
+    把一条记录的总分和有效成绩门数累加到这个 id 的 StudentScore 上
+
+    返回：
+    bool -- 这个 id 之前已经出现过时返回True
+    """
+    score = scores_by_id.get(student_id)
+    if score is None:
+        scores_by_id[student_id] = StudentScore(total, count)
+        return False
+    score.total += total
+    score.count += count
+    return True
+
+
+class StudentAggregator:
+    """
+    单遍聚合：逐个加入学生记录，同时统计学科总分和人数、学科最高分、爱好分布
+    """
+
+    def __init__(self):
+        self.subjects = {}  # 学科 -> SubjectStats，按学科第一次出现的顺序
+        self.hobbies_info = {}  # 每个爱好有多少人
+
+    def add(self, student):
+        """
+        加入一个学生
+
+        参数：
+        student -- 学生信息字典
+
+        返回：
+        tuple -- (这个学生的有效成绩总分, 有效成绩门数)
+        """
+        name = student['name']
+        subjects = self.subjects
+        total = count = 0
+        for subject, score in student['scores'].items():
+            if score:  # 计算有效的成绩
+                score = int(score)
+                total += score
+                count += 1
+                stats = subjects.get(subject)
+                if stats is None:
+                    stats = subjects[subject] = SubjectStats()
+                stats.total += score
+                stats.count += 1
+                if stats.count == 1 or stats.top_score < score:
+                    stats.top_score = score
+                    stats.top_student = name
+        hobbies_info = self.hobbies_info
+        for hobby in student['hobbies']:
+            if hobby:
+                hobbies_info[hobby] = hobbies_info.get(hobby, 0) + 1
+        return total, count
+
+    def merge(self, other):
+        """
+        合并另一个 StudentAggregator（例如另一个文件的部分结果），
+        结果与把 other 的数据接在本对象的数据后面一起统计完全相同：总分和人数直接相加，
+        最高分只有更高时才替换（相同时保留先出现的学生），学科和爱好的先后顺序也不变
+        """
+        subjects = self.subjects
+        for subject, stats in other.subjects.items():
+            mine = subjects.get(subject)
+            if mine is None:
+                mine = subjects[subject] = SubjectStats()
+            if mine.count == 0 or mine.top_score < stats.top_score:
+                mine.top_score = stats.top_score
+                mine.top_student = stats.top_student
+            mine.total += stats.total
+            mine.count += stats.count
+        hobbies_info = self.hobbies_info
+        for hobby, count in other.hobbies_info.items():
+            hobbies_info[hobby] = hobbies_info.get(hobby, 0) + count
+
+    def result(self):
+        """
+        返回输出文件中除 students 以外的三项统计结果
+        """
+        return {
+            "subject_averages": {subject: round(stats.total / stats.count, 2)
+                                 for subject, stats in self.subjects.items()},
+            "subject_top_scores": {subject: {'score': stats.top_score, 'student': stats.top_student}
+                                   for subject, stats in self.subjects.items()},
+            "hobby_distribution": self.hobbies_info,
+        }
+
+
+def summarize_students(students):
+    """
+    单遍统计学生列表，给每个学生加上平均成绩，返回输出文件的完整内容
+
+    参数：
+    students -- 学生信息字典的列表（会被原地加上 average_score 字段）
+
+    返回：
+    dict -- {"students": 按平均成绩降序排列的学生, "subject_averages", "subject_top_scores", "hobby_distribution"}
+    """
+    aggregator = StudentAggregator()
+    scores_by_id = {}  # id -> StudentScore
+    for student in students:
+        total, count = aggregator.add(student)
+        _add_score(scores_by_id, student['id'], total, count)
+
+    # 同一个 id 出现多次时，这些记录都使用按 id 合并后的平均成绩
+    for student in students:
+        average = scores_by_id[student['id']].average()
+        if average is not None:
+            student['average_score'] = average
+
+    # 按照平均分数降序排序
+    students = sorted(students, key=lambda x: -(x.get('average_score', 0)))
+    return {"students": students, **aggregator.result()}
+
+
+class StudentRanking:
+    """
+    平均成绩的排名查询：前N名、某个学生的名次、百分位分数线和分数段直方图，都不需要对全部学生记录排序
+    只保存每个学生的 id、姓名和平均成绩，每个 id 只占一个位置；没有有效成绩的学生不参与排名
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.names = []
+        self.averages = array('d')
+        self._index_by_id = {}  # id -> 下标
+        self._keys = None  # 不同的平均成绩取负数后从小到大排列（即成绩从高到低），用于二分查找
+        self._above = None  # _above[i]：平均成绩高于第i个不同成绩的人数，最后多一项为总人数
+
+    def __len__(self):
+        return len(self.averages)
+
+    def add(self, student_id, name, average):
+        """
+        加入一个学生的平均成绩；id 已经存在时只更新平均成绩（保留第一次加入时的姓名和先后位置），
+        同一个学生不会在前N名、名次、百分位和直方图中被统计多次
+        """
+        index = self._index_by_id.get(student_id)
+        if index is None:
+            self._index_by_id[student_id] = len(self.averages)
+            self.ids.append(student_id)
+            self.names.append(name)
+            self.averages.append(average)
+        else:
+            self.averages[index] = average
+        self._keys = self._above = None  # 数据变了，索引需要重建
+
+    @classmethod
+    def from_students(cls, students):
+        """
+        由已经带有 average_score 字段的学生记录（例如 summarize_students 的结果）构建
+        同一个 id 的多条记录只算一个学生，summarize_students 已经给它们加上了相同的按 id 合并的平均成绩
+        """
+        ranking = cls()
+        for student in students:
+            average = student.get('average_score')
+            if average is not None:
+                ranking.add(student['id'], student['name'], average)
+        return ranking
+
+    def _ensure_index(self):
+        """
+        第一次查询名次或百分位时构建一次索引：按平均成绩统计人数（直方图），再按成绩从高到低累加人数
+        不同平均成绩的个数k通常远小于学生人数（保留两位小数的 0~100 分最多 10001 种）
+        """
+        if self._keys is not None:
+            return
+        histogram = Counter(self.averages)
+        self._keys = sorted(-value for value in histogram)
+        self._above = array('q')
+        seen = 0
+        for key in self._keys:
+            self._above.append(seen)
+            seen += histogram[-key]
+        self._above.append(seen)
+
+    def top(self, n):
+        """
+        前n名，顺序与输出文件中 students 的顺序相同（平均成绩相同的保持原来的先后顺序）
+        heapq.nsmallest 用大小为n的堆选择，复杂度 O(人数 * log n)
+
+        返回：
+        list -- [{"rank", "id", "name", "average_score"}, ...]，平均成绩相同的名次相同
+        """
+        averages = self.averages
+        indexes = heapq.nsmallest(n, range(len(averages)), key=lambda i: -averages[i])
+        result = []
+        for position, i in enumerate(indexes):
+            if position and averages[i] == result[-1]["average_score"]:
+                rank = result[-1]["rank"]
+            else:
+                rank = position + 1
+            result.append({"rank": rank, "id": self.ids[i], "name": self.names[i], "average_score": averages[i]})
+        return result
+
+    def rank_of_score(self, score):
+        """
+        平均成绩为score时的名次 = 平均成绩更高的人数 + 1，二分查找 O(log k)
+        """
+        self._ensure_index()
+        return self._above[bisect_left(self._keys, -score)] + 1
+
+    def rank(self, student_id):
+        """
+        某个学生的名次（1表示最高，平均成绩相同的名次相同），id 不存在或没有有效成绩时返回None
+        """
+        index = self._index_by_id.get(student_id)
+        if index is None:
+            return None
+        return self.rank_of_score(self.averages[index])
+
+    def percentile(self, p):
+        """
+        百分位分数线（最近秩法）：至少有 p% 的学生平均成绩不高于返回的分数，没有学生时返回None
+
+        参数：
+        p -- 百分位，0 < p <= 100，例如 90 表示前10%的分数线
+        """
+        if not 0 < p <= 100:
+            raise ValueError(f"百分位需要在 (0, 100] 之间: {p}")
+        count = len(self.averages)
+        if not count:
+            return None
+        self._ensure_index()
+        # 从低到高第 ceil(p% * 人数) 个学生，也就是从高到低下标为 behind 的学生
+        behind = count - math.ceil(p * count / 100)
+        return -self._keys[bisect_right(self._above, behind) - 1]
+
+    def percentile_buckets(self, percentiles=(10, 25, 50, 75, 90)):
+        """
+        多个百分位的分数线，返回 {百分位: 分数线}
+        """
+        return {p: self.percentile(p) for p in percentiles}
+
+    def histogram(self, bucket_width=10):
+        """
+        按分数段统计人数
+
+        参数：
+        bucket_width -- 分数段宽度
+
+        返回：
+        dict -- {分数段下界: 人数}，按分数从低到高
+        """
+        if bucket_width <= 0:
+            raise ValueError("bucket_width need greater than 0")
+        buckets = Counter(math.floor(value / bucket_width) * bucket_width for value in self.averages)
+        return dict(sorted(buckets.items()))
+
+
+def build_ranking(input_file):
+    """
+    只读取学生JSON文件构建 StudentRanking：流式解析，不保留学生记录，不排序也不写输出文件
+    平均成绩按 id 合并（与 summarize_students 相同），内存中只保留每个 id 的总分、门数和姓名
+
+    参数：
+    input_file -- 输入JSON文件路径
+
+    返回：
+    StudentRanking
+    """
+    try:
+        if not input_file:
+            raise FileNotFoundError('请输入正确的文件地址')
+        aggregator = StudentAggregator()
+        scores_by_id = {}  # id -> StudentScore，按 id 第一次出现的顺序
+        names = {}  # id -> 第一次出现时的姓名
+        with open(input_file, 'r', encoding='utf-8') as file:
+            for student in iter_json_array(file):
+                total, count = aggregator.add(student)
+                if not _add_score(scores_by_id, student['id'], total, count):
+                    names[student['id']] = student['name']
+        ranking = StudentRanking()
+        for student_id, score in scores_by_id.items():
+            average = score.average()
+            if average is not None:
+                ranking.add(student_id, names[student_id], average)
+        return ranking
+
+    except FileNotFoundError:
+        raise  # 重新抛出文件不存在异常
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON格式错误: {str(e)}")
+    except Exception as e:
+        raise Exception(f"处理JSON文件时发生错误: {str(e)}")
+
+
+class JsonSerializer:
+    """
+    标准库 json：默认的序列化后端，不需要额外安装
+    """
+    name = "json"
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj, indent=False):
+        """
+        把对象转成UTF-8编码的JSON字节串；indent=True 时缩进2个空格，否则输出没有多余空格的紧凑格式
+        """
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
 
-    obj[key] += value
 
-def process_student_data(input_file, output_file):
+class OrjsonSerializer(JsonSerializer):
+    """
+    orjson：Rust 实现，直接输出UTF-8字节串，OPT_INDENT_2 的缩进格式和 json.dumps(indent=2) 一致
+    """
+    name = "orjson"
+
+    def loads(self, data):
+        return orjson.loads(data)  # orjson.JSONDecodeError 是 json.JSONDecodeError 的子类
+
+    def dumps(self, obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+
+class MsgspecSerializer(JsonSerializer):
+    """
+    msgspec：C 实现的编码/解码器，缩进输出用 msgspec.json.format() 对编码结果重新排版
+    """
+    name = "msgspec"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data):
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), "", 0)  # 统一成 json 的异常，调用方按格式错误处理
+
+    def dumps(self, obj, indent=False):
+        data = self._encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+
+SERIALIZERS = {"json": JsonSerializer, "orjson": OrjsonSerializer, "msgspec": MsgspecSerializer}
+
+
+def get_serializer(name="json"):
+    """
+    按名字创建序列化后端
+
+    参数：
+    name -- 'json'（默认）、'orjson' 或 'msgspec'，后两个需要先安装对应的包
+
+    返回：
+    序列化后端对象，提供 loads(bytes) 和 dumps(obj, indent=False) -> bytes
+    """
+    if name not in SERIALIZERS:
+        raise ValueError(f"serializer 只能是 {tuple(SERIALIZERS)} 之一: {name}")
+    if (name == "orjson" and orjson is None) or (name == "msgspec" and msgspec is None):
+        raise ImportError(f"serializer='{name}' 需要先安装 {name}：pip install {name}")
+    return SERIALIZERS[name]()
+
+
+def _encode_record(record):
+    # 每行 "排序键\t学生JSON"，%r 保存浮点数，读回来的值不变
+    return b"%r\t%s\n" % record
+
+
+def _decode_record(raw):
+    key, _, line = raw.partition(b"\t")
+    return float(key), line[:-1]
+
+
+# 学生记录有序段：(排序键, 学生JSON字节串)，按二进制读写
+RECORD_CODEC = RunCodec(_encode_record, _decode_record, binary=True)
+
+
+def _dumps_indented(obj, level, serializer):
+    """
+    缩进2个空格的JSON整体再缩进level层，拼起来和一次性 dumps(indent=2) 整个结果的文本完全相同
+    （字符串里的换行会被转义成\\n，所以文本中的换行都是格式化产生的）
+    """
+    return serializer.dumps(obj, indent=True).replace(b"\n", b"\n" + b"  " * level)
+
+
+def _write_statistics(file, students, statistics, serializer):
+    """
+    逐个写出学生记录，再写出其余统计结果，不需要在内存中构造整个结果字典
+
+    参数：
+    file -- 以二进制模式打开的输出文件
+    students -- 按平均分排好序、已经用 _dumps_indented(student, 2, serializer) 转成字节串的学生记录
+    statistics -- StudentAggregator.result() 的结果
+    serializer -- 序列化后端
+    """
+    file.write(b'{\n  "students": [')
+    first = True
+    for student in students:
+        file.write(b"\n    " if first else b",\n    ")
+        file.write(student)
+        first = False
+    file.write(b"]" if first else b"\n  ]")
+    for key, value in statistics.items():
+        file.write(b",\n  %s: %s" % (serializer.dumps(key), _dumps_indented(value, 1, serializer)))
+    file.write(b"\n}")
+
+
+def _write_ndjson(file, lines):
+    """
+    NDJSON：每条记录一行紧凑的JSON，逐行写出，读取时也可以一行一行地解析
+    """
+    for line in lines:
+        file.write(line)
+        file.write(b"\n")
+
+
+def _build_runs(students, run_dir, memory_limit, serializer, students_file):
+    """
+    把带平均分的学生记录转成输出格式，攒到内存上限就按平均分排好序写成有序段
+
+    参数：
+    students -- (学生信息字典, 平均成绩或None) 的可迭代对象
+    其余参数同 _process_streaming
+
+    返回：
+    tuple -- (有序段文件路径列表, 已使用的段编号个数, 内存中剩下的已排序记录)
+    """
+    runs = []
+    run_index = 0
+    records = []
+    used = 0
+    for student, average in students:
+        if average is not None:
+            student['average_score'] = average
+        if students_file:
+            line = serializer.dumps(student)
+        else:
+            # 直接保存输出时的缩进格式，换行换成制表符压成一行（JSON文本中的制表符都会被转义，不会混淆）
+            line = _dumps_indented(student, 2, serializer).replace(b"\n", b"\t")
+        records.append((-(average or 0), line))  # 与 sorted(key=-average_score) 的排序键相同
+        used += sys.getsizeof(line) + 64  # 64字节估算元组、浮点数和列表中的指针
+        if used >= memory_limit:
+            records.sort(key=itemgetter(0))
+            runs.append(write_run(records, run_dir, run_index, RECORD_CODEC))
+            run_index += 1
+            records = []
+            used = 0
+
+    records.sort(key=itemgetter(0))
+    # 只有一个段时不用落盘，直接用内存中排好序的记录
+    if runs and records:
+        runs.append(write_run(records, run_dir, run_index, RECORD_CODEC))
+        run_index += 1
+        records = []
+    return runs, run_index, records
+
+
+def _process_streaming(input_file, output_file, memory_limit, tmp_dir, serializer, students_file):
+    """
+    流式处理：边解析边聚合，带平均分的学生记录按内存上限分段排序落盘，最后归并写出
+    平均成绩按 id 合并（与非流式模式相同），内存中另外保存每个 id 的总分和门数；
+    同一个 id 出现多次时，前面的记录已经按单条记录的平均分写出，所以重新读一遍输入文件，用合并后的平均分重建有序段
+    """
+    aggregator = StudentAggregator()
+    scores_by_id = {}  # id -> StudentScore
+    duplicated = False
+
+    def first_pass(file):
+        nonlocal duplicated
+        for student in iter_json_array(file):
+            total, count = aggregator.add(student)
+            if _add_score(scores_by_id, student['id'], total, count):
+                duplicated = True
+            yield student, (round(total / count, 2) if count else None)
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        with open(input_file, 'r', encoding='utf-8') as file:
+            runs, run_index, records = _build_runs(first_pass(file), run_dir, memory_limit, serializer, students_file)
+
+        if duplicated:
+            for path in runs:
+                os.remove(path)
+            with open(input_file, 'r', encoding='utf-8') as file:
+                students = ((student, scores_by_id[student['id']].average()) for student in iter_json_array(file))
+                runs, run_index, records = _build_runs(students, run_dir, memory_limit, serializer, students_file)
+
+        # 有序段太多时分多轮归并，避免同时打开过多文件
+        runs = reduce_runs(runs, run_dir, run_index, itemgetter(0), RECORD_CODEC)
+        with open_runs(runs, RECORD_CODEC) as run_records:
+            if run_records:
+                sorted_records = heapq.merge(*run_records, key=itemgetter(0))
+            else:
+                sorted_records = iter(records)
+            if students_file:
+                with open(students_file, 'wb') as out:
+                    _write_ndjson(out, (line for _, line in sorted_records))
+                with open(output_file, 'wb') as out:
+                    out.write(serializer.dumps(aggregator.result(), indent=True))
+            else:
+                with open(output_file, 'wb') as out:
+                    _write_statistics(out, (line.replace(b"\t", b"\n") for _, line in sorted_records),
+                                      aggregator.result(), serializer)
+
+
+def _find_student_files(source):
+    """
+    source 是目录时返回其中所有 .json 文件，否则按通配符查找；结果按路径排序
+    """
+    if os.path.isdir(source):
+        source = os.path.join(source, "*.json")
+    input_files = sorted(glob.glob(source))
+    if not input_files:
+        raise FileNotFoundError(f"没有找到学生JSON文件: {source}")
+    return input_files
+
+
+def _aggregate_file(input_file):
+    """
+    子进程任务：流式统计一个学生JSON文件，返回可合并的部分结果（StudentAggregator）
+    """
+    aggregator = StudentAggregator()
+    with open(input_file, 'r', encoding='utf-8') as file:
+        try:
+            for student in iter_json_array(file):
+                aggregator.add(student)
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError(f"{os.path.basename(input_file)}: {e.msg}", e.doc, e.pos)
+    return aggregator
+
+
+def aggregate_student_files(source, output_file=None, workers=None, serializer="json"):
+    """
+    统计多个学生JSON文件（例如每个班级一个文件），
+    结果与把所有文件的学生按文件路径顺序合成一个文件后用 process_student_data 统计的三项结果相同
+
+    参数：
+    source -- 目录（统计其中所有 .json 文件）或通配符，例如 "data/class_*.json"
+    output_file -- 给出时把结果写入这个JSON文件
+    workers -- 进程数，默认 os.cpu_count()，不超过文件个数；为1时在当前进程中依次处理
+    serializer -- 写输出文件时使用的序列化后端
+
+    返回：
+    dict -- {"subject_averages", "subject_top_scores", "hobby_distribution"}
+    """
+    serializer = get_serializer(serializer)
+    try:
+        if not source:
+            raise FileNotFoundError('请输入正确的文件地址')
+        input_files = _find_student_files(source)
+        workers = min(workers or os.cpu_count() or 1, len(input_files))
+        aggregator = StudentAggregator()
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # 按文件顺序合并，最高分相同时保留先出现的学生
+                for partial in executor.map(_aggregate_file, input_files):
+                    aggregator.merge(partial)
+        else:
+            for input_file in input_files:
+                aggregator.merge(_aggregate_file(input_file))
+        result = aggregator.result()
+
+        if output_file:
+            with open(output_file, 'wb') as file:
+                file.write(serializer.dumps(result, indent=True))
+        return result
+
+    except FileNotFoundError:
+        raise  # 重新抛出文件不存在异常
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON格式错误: {str(e)}")
+    except Exception as e:
+        raise Exception(f"处理JSON文件时发生错误: {str(e)}")
+
+
+def process_student_data(input_file, output_file, streaming=False, memory_limit=MEMORY_LIMIT, tmp_dir=None,
+                         serializer="json", students_file=None):
     """
     处理学生JSON数据，生成统计结果并输出到新文件
     
     参数：
     input_file -- 输入JSON文件路径
     output_file -- 输出JSON文件路径
+    streaming -- 为True时使用流式模式：增量解析、边读边统计，学生记录分段排序后落盘再归并，
+                 学生记录不常驻内存（同一个 id 的多条记录按 id 合并平均成绩，与非流式模式相同）
+    memory_limit -- 流式模式下内存中学生记录的上限（字节）
+    tmp_dir -- 流式模式下有序段临时文件所在目录，默认使用系统临时目录
+    serializer -- 序列化后端：'json'（默认）、'orjson'、'msgspec'，输出内容相同（流式模式的解析始终用标准库）
+    students_file -- 给出时把排好序的学生列表逐条写成这个 NDJSON 文件，output_file 中只保留其余三项统计
     
     返回：
     bool -- 处理成功返回True，否则抛出异常
     """
+    serializer = get_serializer(serializer)
     try:
         if not input_file:
             raise FileNotFoundError('请输入正确的文件地址')
-        with open(input_file, 'r', encoding='utf-8') as file:
-            students = json.load(file)
-
-            student_avg = {}  # 统计每个学生的平均成绩
-            subject_avg = {}  # 统计每科的平均成绩
-            subject_max_info = {} # 统计每科的最高成绩和人
-            hobbies_info = {} # 统计每个爱好有多少人
-            subject_stedent_count = {}  # 每个科有多少学生，用于计算平均成绩
-            student_subject_count = {} # 每个学生有多少门科
-            for student in students:
-                name = student['name']
-                for subject, score in student['scores'].items():
-                    if score: # 计算有效的成绩
-                        score = int(score)
-                        put_in_dict(student_avg, name, score)
-                        put_in_dict(student_subject_count, name, 1)
-                        put_in_dict(subject_avg, subject, score)
-                        put_in_dict(subject_stedent_count, subject, 1)
-
-                        if subject not in subject_max_info or subject_max_info[subject]['score'] < score:
-                            subject_max_info[subject] = {'score': score, 'student': name}
-
-                for hobby in student['hobbies']:
-                    if hobby:
-                        put_in_dict(hobbies_info, hobby, 1)
-
-            # 计算每个人的平均成绩
-            for student in students:
-                name = student['name']
-                if name in student_avg and name in student_subject_count:
-                    student['average_score'] = round(student_avg[name] / student_subject_count[name], 2)
-            
-            # 按照平均分数降序排序
-            students = sorted(students, key=lambda x: -(x.get('average_score', 0)))
-
-            # 计算学科平均分
-            for subject, score in subject_avg.items():
-                subject_avg[subject] = round(score / subject_stedent_count[subject], 2)
-
-            # 组合成最后的json
-            merged_dict = {
-                "students": students,
-                "subject_averages": subject_avg,
-                "subject_top_scores": subject_max_info,
-                "hobby_distribution": hobbies_info
-            }
-
+        if streaming:
             if not output_file:
                 raise FileNotFoundError('请输入正确的文件地址')
-            
-            with open(output_file, 'w', encoding='utf-8') as file:
-                json.dump(merged_dict, file, indent=2, ensure_ascii=False)
-                        
+            _process_streaming(input_file, output_file, memory_limit, tmp_dir, serializer, students_file)
+            return True
+        with open(input_file, 'rb') as file:
+            students = serializer.loads(file.read())
+
+        merged_dict = summarize_students(students)
+
+        if not output_file:
+            raise FileNotFoundError('请输入正确的文件地址')
+
+        if students_file:
+            with open(students_file, 'wb') as file:
+                _write_ndjson(file, map(serializer.dumps, merged_dict.pop("students")))
+
+        with open(output_file, 'wb') as file:
+            file.write(serializer.dumps(merged_dict, indent=True))
+
         return True  # 操作成功完成
         
     except FileNotFoundError:
@@ -137,6 +823,9 @@ if __name__ == "__main__":
         result = process_student_data(input_file_path, output_file_path)
         if result:
             print(f"成功处理学生数据并写入到 {output_file_path}")
+        ranking = build_ranking(input_file_path)
+        print(f"平均成绩前3名：{ranking.top(3)}")
+        print(f"中位数分数线：{ranking.percentile(50)}")
     except FileNotFoundError:
         print(f"错误：找不到输入文件 {input_file_path}")
     except ValueError as e:
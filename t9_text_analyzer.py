@@ -47,6 +47,10 @@
    - 使用集合(set)存储停用词和情感词汇是高效的，因为查找操作时间复杂度为O(1)
    - 使用字典(dict)存储单词计数和分析结果便于快速访问和更新
    - sorted()函数的key参数使用lambda表达式实现自定义排序逻辑
+
+6. 只需要前5个高频词时不必对整个词表排序：
+   - 先过滤掉停用词，再用 t6_word_count.top_words（heapq.nsmallest）选出前k个，时间 O(V log k)
+   - 排序键同样是 (-次数, 单词)，并列时的顺序和完整排序一致
 '''
 
 import os
@@ -54,6 +58,8 @@ import re
 import csv
 import traceback
 
+from t6_word_count import top_words
+
 # 常见英文停用词列表, {}默认是dict，但是像这样写代表只有key没有value，就代表是集合
 STOP_WORDS = {
     "the", "and", "a", "to", "of", "in", "is", "that", "it", "with", "for", "as", "on", 
@@ -72,6 +78,9 @@ NEGATIVE_WORDS = {
     "awful", "wrong", "worse", "difficult", "hard", "problem", "fail"
 }
 
+# 报告中记录的高频词个数
+TOP_WORDS_COUNT = 5
+
 #字段映射
 FIELD_MAPPING={
     "file_name":"文件名",
@@ -129,29 +138,21 @@ def analyze_file(file_path):
                         words_count[words]=0
                     words_count[words]+=1
 
-        #按照出现频率降序排序,sorted返回的是一个list，如果是对map排序，那么返回的是list[元组]类型
-        words_count=sorted(words_count.items(),key=lambda x: (-x[1],x[0]))
-
         #4、记录行数
         file_analyze_result[FIELD_MAPPING['total_line_counts']]=line_count
 
         #5、记录平均句子长度 总字数/总段落数
         file_analyze_result[FIELD_MAPPING['avg_line_lne']]=round( file_analyze_result[FIELD_MAPPING['total_words']]/file_analyze_result[FIELD_MAPPING['total_section_counts']] ,2)
 
-        #6、记录最常见的前5个词汇，排除常见停用词
-        i=0
-        for word,_ in words_count:
-            if i >=5:
-                break
-            if word not in STOP_WORDS:
-                common_key=f"commonest_{i+1}"
-                file_analyze_result[FIELD_MAPPING[common_key]]=word
-                i+=1
+        #6、记录最常见的前5个词汇，先排除常见停用词，再用堆选出前5个（按频率降序，频率相同按字母顺序）
+        for i,(word,_) in enumerate(top_words(words_count,TOP_WORDS_COUNT,STOP_WORDS)):
+            common_key=f"commonest_{i+1}"
+            file_analyze_result[FIELD_MAPPING[common_key]]=word
 
         #7、遍历单词，判断情感倾向
         positive_counts=0
         negative_counts=0
-        for word,counts in words_count:
+        for word,counts in words_count.items():
             if word in POSITIVE_WORDS:
                 positive_counts+=counts
             elif word in NEGATIVE_WORDS:
@@ -190,7 +191,7 @@ def analyze_directory(directory_path):
     file_list = os.listdir(directory_path)
     for file_path in file_list:
         file_name = os.path.basename(file_path)
-        analyze_result[file_name]=analyze_file(f'{directory_path}\\\\{file_path}')
+        analyze_result[file_name]=analyze_file(os.path.join(directory_path, file_path))
     
     return analyze_result
         